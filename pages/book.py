@@ -1,3 +1,4 @@
+import html
 import streamlit as st
 from services.firebase_auth import get_user_id
 from services.trip_storage import load_trip, list_trips, update_trip
@@ -6,6 +7,68 @@ from styles.page_headers import BOOK_HEADER
 from datetime import datetime
 import random
 
+# Essential documents checklist for Step 5
+DOCUMENT_ESSENTIALS = ("Valid passport", "Visa (if required)", "Flight tickets", "Hotel confirmations")
+
+# Material icons for the hotel amenities we highlight
+AMENITY_ICONS = {
+    'Free Wi-Fi': ':material/wifi:',
+    'Pool': ':material/pool:',
+    'Parking': ':material/local_parking:',
+    'Gym': ':material/fitness_center:',
+    'Restaurant': ':material/restaurant:',
+    'Air conditioning': ':material/ac_unit:',
+    'Spa': ':material/spa:'
+}
+
+# Radio option label templates (missing fields render as 'N/A')
+FLIGHT_OPTION_LABEL = "Flight {idx}: {airline} - {price} ({departure_time} → {arrival_time})".format_map
+HOTEL_OPTION_LABEL = "Hotel {idx}: {name} - {total_rate} (Rating: {rating}/5)".format_map
+EVENT_OPTION_LABEL = "Event {idx}: {title} at {venue} ({date})".format_map
+
+class _OptionFields(dict):
+    """Result dict view used with the option label templates"""
+    def __missing__(self, key):
+        return 'N/A'
+
+def _safe_int(value):
+    """Convert a loosely-typed API value to int, falling back to 0"""
+    try:
+        return int(value) if value else 0
+    except (ValueError, TypeError):
+        return 0
+
+def normalize_hotel(hotel):
+    """Extract the display fields of a hotel result once, at selection time"""
+    rating = hotel.get('rating', 0)
+    reviews = hotel.get('reviews', 0)
+    rating_caption = None
+    # Safely handle rating and reviews display
+    try:
+        if rating and rating != 'N/A':
+            rating_val = float(rating) if isinstance(rating, str) else rating
+            reviews_val = int(reviews) if reviews and reviews != 'N/A' else 0
+            rating_caption = f":material/star: {rating_val}/5 · {reviews_val:,} reviews"
+    except (ValueError, TypeError):
+        pass  # Skip if conversion fails
+    
+    # Build the amenity caption in one pass over the first four amenities
+    amenity_str = " • ".join(
+        f"{AMENITY_ICONS.get(a, '✓')} {a}" for a in (hotel.get('amenities') or ())[:4]
+    )
+    
+    return {
+        'name': hotel.get('name', 'N/A'),
+        'type': hotel.get('type', 'Hotel'),
+        'stars': "⭐" * _safe_int(hotel.get('extracted_hotel_class', 0)),
+        'rating_caption': rating_caption,
+        'amenity_str': amenity_str,
+        'eco': bool(hotel.get('eco_certified')),
+        'per_night': hotel.get('rate_per_night', 'N/A'),
+        'total': hotel.get('total_rate', 'N/A'),
+        'nearby_count': len(hotel.get('nearby_places') or ())
+    }
+
 # Payment Modal
 @st.dialog("💳 Complete Payment", width="large")
 def show_payment_modal(trip_id, amount, trip_name):
@@ -412,6 +475,12 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
         print(f"[BOOKING] Initialized fresh progress for trip {trip_id}")
     
     progress = st.session_state[progress_key]
+    # Read each step's status once; refreshed below when a step completes without a rerun
+    p_flights = progress['flights']
+    p_acc = progress['accommodation']
+    p_act = progress['activities']
+    p_ins = progress['insurance']
+    p_doc = progress['documents']
     total_steps = len(progress)
     completed_steps = sum(progress.values())
     
@@ -481,7 +550,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
     # Booking checklist steps
     with st.container(border=True):
         # Step 1: Flights
-        with st.expander(":material/flight: **Flights**", expanded=not progress['flights']):
+        with st.expander(":material/flight: **Flights**", expanded=not p_flights):
             st.write(f"**Route:** {origin} → {destination}")
             st.write(f"**Date:** {start_date}")
             st.write(f"**Passengers:** {group_size}")
@@ -538,13 +607,10 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                         st.session_state[flight_selection_key] = None
                     
                     # Create flight options for radio group
-                    flight_options = []
-                    for idx, flight in enumerate(flights_to_show, 1):
-                        airline = flight.get('airline', 'N/A')
-                        price = flight.get('price', 'N/A')
-                        departure = flight.get('departure_time', 'N/A')
-                        arrival = flight.get('arrival_time', 'N/A')
-                        flight_options.append(f"Flight {idx}: {airline} - {price} ({departure} → {arrival})")
+                    flight_options = [
+                        FLIGHT_OPTION_LABEL(_OptionFields(flight, idx=idx))
+                        for idx, flight in enumerate(flights_to_show, 1)
+                    ]
                     
                     # Single radio group for all flights
                     # Validate stored index is within range
@@ -556,7 +622,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     selected_option = st.radio(
                         "Choose your flight:",
                         options=range(len(flights_to_show)),
-                        format_func=lambda x: flight_options[x],
+                        format_func=flight_options.__getitem__,
                         key=f"flight_radio_group_{trip_id}",
                         index=default_index
                     )
@@ -660,7 +726,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     st.rerun()
         
         # Step 2: Accommodation
-        with st.expander(":material/hotel: **Accommodation**", expanded=progress['flights'] and not progress['accommodation']):
+        with st.expander(":material/hotel: **Accommodation**", expanded=p_flights and not p_acc):
             st.write(f"**Location:** {destination}")
             st.write(f"**Check-in:** {start_date}")
             st.write(f"**Check-out:** {end_date}")
@@ -680,7 +746,17 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                             check_out=end_date,
                             adults=group_size
                         )
+                        # Don't keep failed lookups in the search cache
+                        if not hotel_results.get('success'):
+                            search_hotels.clear(
+                                location=destination,
+                                check_in=start_date,
+                                check_out=end_date,
+                                adults=group_size
+                            )
                         st.session_state[f'hotel_results_{trip_id}'] = hotel_results
+                        # New results replace the hotel list, so drop the cached selection view
+                        st.session_state.pop(f'selected_hotel_view_{trip_id}', None)
             
             with col_manual:
                 st.link_button(":material/language: Search on EaseMyTrip", "https://www.easemytrip.com/hotels/", use_container_width=True)
@@ -709,12 +785,10 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                         st.session_state[hotel_selection_key] = None
                     
                     # Create hotel options for radio group
-                    hotel_options = []
-                    for idx, hotel in enumerate(hotels_to_show, 1):
-                        name = hotel.get('name', 'N/A')
-                        total = hotel.get('total_rate', 'N/A')
-                        rating = hotel.get('rating', 'N/A')
-                        hotel_options.append(f"Hotel {idx}: {name} - {total} (Rating: {rating}/5)")
+                    hotel_options = [
+                        HOTEL_OPTION_LABEL(_OptionFields(hotel, idx=idx))
+                        for idx, hotel in enumerate(hotels_to_show, 1)
+                    ]
                     
                     # Single radio group for all hotels
                     # Validate stored index is within range
@@ -726,85 +800,54 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     selected_option = st.radio(
                         "Choose your hotel:",
                         options=range(len(hotels_to_show)),
-                        format_func=lambda x: hotel_options[x],
+                        format_func=hotel_options.__getitem__,
                         key=f"hotel_radio_group_{trip_id}",
                         index=default_index
                     )
                     
                     # Update selection when changed
+                    hotel_view_key = f'selected_hotel_view_{trip_id}'
                     if selected_option is not None:
                         st.session_state[hotel_selection_key] = selected_option
-                        st.session_state[f'selected_hotel_data_{trip_id}'] = hotels_to_show[selected_option]
+                        # Normalize display fields only when the selected index changes
+                        cached_view = st.session_state.get(hotel_view_key)
+                        if cached_view is None or cached_view[0] != selected_option:
+                            selected_hotel_raw = hotels_to_show[selected_option]
+                            st.session_state[hotel_view_key] = (selected_option, normalize_hotel(selected_hotel_raw))
+                            st.session_state[f'selected_hotel_data_{trip_id}'] = selected_hotel_raw
                     
                     # Display selected hotel details
                     if selected_option is not None:
                         st.markdown("---")
                         st.markdown("**Selected Hotel Details:**")
-                        hotel = hotels_to_show[selected_option]
+                        hotel = st.session_state[hotel_view_key][1]
                         
                         with st.container(border=True):
-                            col1, col2 = st.columns([3, 1])
+                            # Hotel name with pricing floated right (no nested columns);
+                            # SerpAPI strings are escaped since this markdown allows HTML
+                            st.markdown(
+                                f"**{html.escape(str(hotel['name']))}** {hotel['stars']}"
+                                f"<span style='float: right'>**{html.escape(str(hotel['per_night']))}** per night"
+                                f" · **Total: {html.escape(str(hotel['total']))}**</span>",
+                                unsafe_allow_html=True
+                            )
+                            st.caption(f":material/location_on: {hotel['type']}")
                             
-                            with col1:
-                                # Hotel name and type
-                                hotel_type = hotel.get('type', 'Hotel')
-                                hotel_class = hotel.get('extracted_hotel_class', 0)
-                                # Safely convert hotel_class to int
-                                try:
-                                    hotel_class_int = int(hotel_class) if hotel_class else 0
-                                    stars = "⭐" * hotel_class_int if hotel_class_int > 0 else ""
-                                except (ValueError, TypeError):
-                                    stars = ""
-                                
-                                st.write(f"**{hotel.get('name', 'N/A')}** {stars}")
-                                st.caption(f":material/location_on: {hotel_type}")
-                                
-                                # Rating and reviews
-                                rating = hotel.get('rating', 0)
-                                reviews = hotel.get('reviews', 0)
-                                # Safely handle rating and reviews display
-                                try:
-                                    if rating and rating != 'N/A':
-                                        rating_val = float(rating) if isinstance(rating, str) else rating
-                                        reviews_val = int(reviews) if reviews and reviews != 'N/A' else 0
-                                        st.caption(f":material/star: {rating_val}/5 · {reviews_val:,} reviews")
-                                except (ValueError, TypeError):
-                                    pass  # Skip if conversion fails
-                                
-                                # Amenities
-                                amenities = hotel.get('amenities', [])[:5]
-                                if amenities:
-                                    amenity_icons = {
-                                        'Free Wi-Fi': ':material/wifi:',
-                                        'Pool': ':material/pool:',
-                                        'Parking': ':material/local_parking:',
-                                        'Gym': ':material/fitness_center:',
-                                        'Restaurant': ':material/restaurant:',
-                                        'Air conditioning': ':material/ac_unit:',
-                                        'Spa': ':material/spa:'
-                                    }
-                                    amenity_str = " • ".join([
-                                        amenity_icons.get(a, '✓') + " " + a 
-                                        for a in amenities[:4]
-                                    ])
-                                    st.caption(amenity_str)
-                                
-                                # Eco certified badge
-                                if hotel.get('eco_certified'):
-                                    st.caption(":material/eco: Eco Certified")
+                            # Rating and reviews
+                            if hotel['rating_caption']:
+                                st.caption(hotel['rating_caption'])
                             
-                            with col2:
-                                per_night = hotel.get('rate_per_night', 'N/A')
-                                total = hotel.get('total_rate', 'N/A')
-                                
-                                st.markdown(f"### {per_night}")
-                                st.caption("per night")
-                                st.markdown(f"**Total: {total}**")
-                                
-                                # Show nearby places if available
-                                nearby = hotel.get('nearby_places', [])
-                                if nearby:
-                                    st.caption(f":material/location_on: Near {len(nearby)} attractions")
+                            # Amenities
+                            if hotel['amenity_str']:
+                                st.caption(hotel['amenity_str'])
+                            
+                            # Eco certified badge
+                            if hotel['eco']:
+                                st.caption(":material/eco: Eco Certified")
+                            
+                            # Show nearby places if available
+                            if hotel['nearby_count']:
+                                st.caption(f":material/location_on: Near {hotel['nearby_count']} attractions")
                     
                     # Confirm Hotel Selection Button
                     st.markdown("---")
@@ -851,7 +894,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     st.rerun()
         
         # Step 3: Activities & Events
-        with st.expander(":material/local_activity: **Activities & Events**", expanded=progress['accommodation'] and not progress['activities']):
+        with st.expander(":material/local_activity: **Activities & Events**", expanded=p_acc and not p_act):
             st.write(f"**Destination:** {destination}")
             st.write(f"**Travel Style:** {form_data.get('travel_type', 'N/A')}")
             
@@ -877,6 +920,13 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                             start_date=start_date,
                             end_date=end_date
                         )
+                        # Don't keep failed lookups in the search cache
+                        if not event_results.get('success'):
+                            search_events.clear(
+                                location=destination,
+                                start_date=start_date,
+                                end_date=end_date
+                            )
                         st.session_state[f'event_results_{trip_id}'] = event_results
             
             with col_manual:
@@ -906,12 +956,10 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                         st.session_state[event_selection_key] = None
                     
                     # Create event options for radio group
-                    event_options = []
-                    for idx, event in enumerate(events_to_show, 1):
-                        title = event.get('title', 'N/A')
-                        venue = event.get('venue', 'N/A')
-                        date = event.get('date', 'N/A')
-                        event_options.append(f"Event {idx}: {title} at {venue} ({date})")
+                    event_options = [
+                        EVENT_OPTION_LABEL(_OptionFields(event, idx=idx))
+                        for idx, event in enumerate(events_to_show, 1)
+                    ]
                     
                     # Single radio group for all events
                     # Validate stored index is within range
@@ -923,7 +971,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     selected_option = st.radio(
                         "Choose your event/activity:",
                         options=range(len(events_to_show)),
-                        format_func=lambda x: event_options[x],
+                        format_func=event_options.__getitem__,
                         key=f"event_radio_group_{trip_id}",
                         index=default_index
                     )
@@ -940,19 +988,17 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                         event = events_to_show[selected_option]
                         
                         with st.container(border=True):
-                            col1, col2 = st.columns([3, 1])
+                            st.write(f"**{event.get('title', 'N/A')}**")
                             
-                            with col1:
-                                st.write(f"**{event.get('title', 'N/A')}**")
-                                venue = event.get('venue', 'N/A')
-                                st.caption(f":material/location_on: {venue}")
-                            
-                            with col2:
-                                date = event.get('date', 'N/A')
-                                time = event.get('time', 'N/A')
-                                st.caption(f":material/calendar_today: {date}")
-                                if time != 'N/A':
-                                    st.caption(f":material/schedule: {time}")
+                            # Venue, date and time on a single caption line
+                            event_details = [
+                                f":material/location_on: {event.get('venue', 'N/A')}",
+                                f":material/calendar_today: {event.get('date', 'N/A')}"
+                            ]
+                            event_time = event.get('time', 'N/A')
+                            if event_time != 'N/A':
+                                event_details.append(f":material/schedule: {event_time}")
+                            st.caption(" · ".join(event_details))
                     
                     # Confirm Event Selection Button
                     st.markdown("---")
@@ -999,28 +1045,32 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
                     st.rerun()
         
         # Step 4: Travel Insurance
-        with st.expander(":material/security: **Travel Insurance**", expanded=progress['activities'] and not progress['insurance']):
+        with st.expander(":material/security: **Travel Insurance**", expanded=p_act and not p_ins):
             st.write("**Coverage includes:**")
             st.write("• Trip cancellations")
             st.write("• Medical emergencies")
             st.write("• Lost baggage")
             
-            insurance_checked = st.checkbox(":material/check_circle: Insurance Secured", key=f"insurance_check_{trip_id}", value=progress['insurance'])
-            if insurance_checked and not progress['insurance']:
+            insurance_checked = st.checkbox(":material/check_circle: Insurance Secured", key=f"insurance_check_{trip_id}", value=p_ins)
+            if insurance_checked and not p_ins:
                 st.session_state[progress_key]['insurance'] = True
+                p_ins = True
                 st.success("You're protected! :material/verified_user:")
         
         # Step 5: Documents
-        with st.expander(":material/description: **Documents**", expanded=progress['insurance'] and not progress['documents']):
-            st.write("**Essential items:**")
-            st.checkbox("Valid passport", key=f"doc_passport_{trip_id}")
-            st.checkbox("Visa (if required)", key=f"doc_visa_{trip_id}")
-            st.checkbox("Flight tickets", key=f"doc_flights_{trip_id}")
-            st.checkbox("Hotel confirmations", key=f"doc_hotels_{trip_id}")
+        with st.expander(":material/description: **Documents**", expanded=p_ins and not p_doc):
+            # Single multiselect instead of one checkbox per item
+            packed_documents = st.multiselect(
+                "Essential items packed:",
+                options=DOCUMENT_ESSENTIALS,
+                key=f"doc_essentials_{trip_id}",
+                placeholder="Select the documents you have ready"
+            )
             
-            documents_checked = st.checkbox(":material/check_circle: All Documents Ready", key=f"documents_check_{trip_id}", value=progress['documents'])
-            if documents_checked and not progress['documents']:
+            all_documents_ready = len(packed_documents) == len(DOCUMENT_ESSENTIALS)
+            if all_documents_ready and not p_doc:
                 st.session_state[progress_key]['documents'] = True
+                p_doc = True
                 st.success("You're ready to go! :material/celebration:")
                 st.balloons()
     
@@ -1029,7 +1079,7 @@ if st.session_state.get("booking_contact_info", {}).get("saved"):
     hotel_confirmed = st.session_state.get(f'hotel_confirmed_{trip_id}', False)
     events_confirmed = st.session_state.get(f'events_confirmed_{trip_id}', False)
     
-    all_confirmed = flight_confirmed and hotel_confirmed and events_confirmed and progress['insurance'] and progress['documents']
+    all_confirmed = flight_confirmed and hotel_confirmed and events_confirmed and p_ins and p_doc
     payment_completed = st.session_state.get(f'payment_completed_{trip_id}', False)
     
     if all_confirmed and not payment_completed:
@@ -1,17 +1,64 @@
+import html
 import streamlit as st
 from datetime import datetime
+import logging
 import re
 from services.firebase_auth import get_user_id
-from services.gemini import TripSenseAI
 from services.prompt_loader import load_system_prompt
 from services.logging import logger, initialize_metrics
 from services.trip_storage import save_trip
-from styles.styles import CHATBOT_HEADER
+from styles.styles import CHATBOT_HEADER, CHATBOT_TRIP_DESCRIPTION
 
-SYSTEM_INSTRUCTION = load_system_prompt()
+@st.cache_data
+def _load_prompt() -> str:
+    """Load the system prompt from disk once instead of on every rerun."""
+    return load_system_prompt()
 
-# Initialize metrics tracking
-initialize_metrics()
+SYSTEM_INSTRUCTION = _load_prompt()
+
+# UTF-8 text decoded as cp1252 -> intended character
+MOJIBAKE_FIXES = {
+    'â€™': "'",
+    'â€œ': '"',
+    'â€\u201c': '–',
+    'â€\u201d': '—',
+    'â€': '"'
+}
+# Longest sequences first so the bare 'â€' prefix only matches as a fallback
+MOJIBAKE_RE = re.compile('|'.join(map(re.escape, sorted(MOJIBAKE_FIXES, key=len, reverse=True))))
+HEADER_SPACING_RE = re.compile(r'(\n|^)(#{1,6})\s*')
+BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+
+# Roles shown in the chat (system messages are handled internally)
+CHAT_ROLES = frozenset(("user", "assistant"))
+
+# Initialize metrics tracking (once per session)
+if "metrics" not in st.session_state:
+    initialize_metrics()
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def clean_markdown(content: str) -> str:
+    """Normalize markdown content; memoized since messages never change once added."""
+    # Clean and normalize content
+    content = str(content).strip()
+    
+    # Fast path: nothing to normalize in most replies
+    needs_fix = '\r' in content or 'â' in content or '#' in content or '**' in content
+    if needs_fix:
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Fix encoding issues (single pass over all mojibake sequences)
+        if 'â' in content:
+            content = MOJIBAKE_RE.sub(lambda m: MOJIBAKE_FIXES[m.group(0)], content)
+        
+        # Fix markdown formatting
+        if '#' in content:
+            content = HEADER_SPACING_RE.sub(r'\1\2 ', content)  # Header spacing
+        if '**' in content:
+            content = BOLD_RE.sub(r'**\1**', content)   # Bold formatting
+    
+    return content
 
 def clean_and_render_markdown(content: str) -> None:
     """Clean and render markdown content with proper formatting."""
@@ -19,17 +66,7 @@ def clean_and_render_markdown(content: str) -> None:
         st.markdown("*No content to display*")
         return
     
-    # Clean and normalize content
-    content = str(content).strip()
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
-    
-    # Fix encoding issues
-    content = content.replace('â€™', "'").replace('â€œ', '"').replace('â€', '"')
-    content = content.replace('â€"', '–').replace('â€"', '—')
-    
-    # Fix markdown formatting
-    content = re.sub(r'(\n|^)(#{1,6})\s*', r'\1\2 ', content)  # Header spacing
-    content = re.sub(r'\*\*([^*]+)\*\*', r'**\1**', content)   # Bold formatting
+    content = clean_markdown(str(content))
     
     # Render with fallback
     try:
@@ -38,6 +75,44 @@ def clean_and_render_markdown(content: str) -> None:
         logger.warning(f"Markdown rendering failed: {e}")
         st.code(content, language="markdown")
 
+def append_message(role: str, content: str) -> None:
+    """Append a chat message together with its cleaned markdown, computed once."""
+    rendered_content = clean_markdown(str(content)) if content else "*No content to display*"
+    # Bubbles render with unsafe_allow_html, so user-typed HTML is escaped here once
+    if role == "user":
+        rendered_content = html.escape(rendered_content)
+    st.session_state.messages.append({
+        "role": role,
+        "content": content,
+        "rendered_content": rendered_content
+    })
+    st.session_state.messages_version = st.session_state.get('messages_version', 0) + 1
+
+def get_fallback_itinerary(messages) -> str:
+    """Find the first substantial AI response, rescanning only after new messages arrive."""
+    cache_key = (st.session_state.get('messages_version', 0), len(messages))
+    cached = st.session_state.get('fallback_itinerary_cache')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    # Single lazy pass: stop at the first substantial response (short ones are likely not the itinerary)
+    first_response = None
+    trip_itinerary = None
+    for msg in messages:
+        if msg['role'] != 'assistant':
+            continue
+        if first_response is None:
+            first_response = msg['content']
+        if len(msg['content'].strip()) > 200:
+            trip_itinerary = msg['content']
+            break
+    
+    if trip_itinerary is None:
+        trip_itinerary = first_response if first_response is not None else "No detailed itinerary available."
+    
+    st.session_state.fallback_itinerary_cache = (cache_key, trip_itinerary)
+    return trip_itinerary
+
 # Initialize chatbot-specific session state
 def initialize_chatbot_session():
     """Initialize chatbot session state variables"""
@@ -54,9 +129,8 @@ def initialize_chatbot_session():
         
         # Initialize messages only if not already present
         if "messages" not in st.session_state:
-            st.session_state.messages = [
-                {"role": "assistant", "content": "Hi! I can help plan trips. Tell me destination, dates, budget, interests."},
-            ]
+            st.session_state.messages = []
+            append_message("assistant", "Hi! I can help plan trips. Tell me destination, dates, budget, interests.")
             logger.info("Chatbot session initialized with welcome message")
         else:
             logger.debug("Chatbot session initialized (messages preserved)")
@@ -67,10 +141,6 @@ def initialize_chatbot_session():
 # Always initialize the chatbot session (but with controlled logging)
 initialize_chatbot_session()
 
-# Reset rerunning flag at the start of each script execution
-if st.session_state.get('rerunning', False):
-    st.session_state.rerunning = False
-
 # Function to clean up chatbot session state when navigating away
 def cleanup_chatbot_session():
     """Clean up chatbot-specific session state"""
@@ -81,28 +151,44 @@ def cleanup_chatbot_session():
         "chatbot_session_fully_initialized"
     ]
     
-    removed_keys = []
+    # Only track what was removed when debug logging is on
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        removed_keys = [key for key in keys_to_remove if key in st.session_state]
+    
     for key in keys_to_remove:
-        if key in st.session_state:
-            del st.session_state[key]
-            removed_keys.append(key)
+        st.session_state.pop(key, None)
     
     # Only log if we actually removed something significant
-    if removed_keys:
-        logger.debug(f"Cleaned up chatbot UI state: {removed_keys}")
+    if debug_enabled and removed_keys:
+        logger.debug("Cleaned up chatbot UI state: %s", removed_keys)
 
 # Chat interface UI
-def render_chat():
-    for m in st.session_state.messages:
-        # Only display user and assistant messages (system messages are handled internally)
-        if m["role"] in ["user", "assistant"]:
-            with st.chat_message(m["role"]):
+def render_message(m):
+    """Render a single chat message bubble."""
+    # Only display user and assistant messages (system messages are handled internally)
+    if m["role"] in CHAT_ROLES:
+        with st.chat_message(m["role"]):
+            # Messages added via append_message carry their cleaned markdown
+            if "rendered_content" in m:
+                st.markdown(m["rendered_content"], unsafe_allow_html=True)
+            else:
                 clean_and_render_markdown(m["content"])
 
+def render_chat(start: int = 0):
+    """Render chat messages, optionally only those from index `start` onwards."""
+    # Each bubble shows the markdown cleaned once in append_message, so reruns only re-emit it
+    for m in st.session_state.messages[start:]:
+        render_message(m)
+
 st.markdown(CHATBOT_HEADER, unsafe_allow_html=True)
 
+# Read trip state once per rerun
+trip_data = st.session_state.get('trip_data')
+initial_prompt = st.session_state.get('initial_prompt')
+
 # Safety check: If no trip data, redirect to form
-if not st.session_state.get('trip_data') or not st.session_state.get('initial_prompt'):
+if not trip_data or not initial_prompt:
     st.warning("No trip data found. Please create a new trip plan.")
     st.info("Use the **Plan** button on top to start planning.")
     
@@ -116,24 +202,30 @@ if not st.session_state.get('trip_data') or not st.session_state.get('initial_pr
     
     st.stop()  # Stop execution here
 
-trip_data = st.session_state.trip_data
-initial_prompt = st.session_state.initial_prompt
-
 if "saved_trip_data" not in st.session_state:
     st.session_state.saved_trip_data = []
 
-if st.session_state.trip_data:
-    start_date_str = datetime.fromisoformat(trip_data['start_date']).strftime('%b %d')
-    end_date_str = datetime.fromisoformat(trip_data['end_date']).strftime('%b %d, %Y')
-    origin = trip_data.get('origin', '')
-    destination = trip_data.get('destination', 'your destination')
+if trip_data:
+    # Only re-parse and re-format dates when the trip itself changes
+    description_key = (
+        trip_data.get('start_date'),
+        trip_data.get('end_date'),
+        trip_data.get('origin', ''),
+        trip_data.get('destination', 'your destination')
+    )
+    if st.session_state.get('trip_description_key') != description_key:
+        start_date, end_date, origin, destination = description_key
+        start_date_str = datetime.fromisoformat(start_date).strftime('%b %d')
+        end_date_str = datetime.fromisoformat(end_date).strftime('%b %d, %Y')
+        st.session_state.trip_description = f"Planning your trip from {origin} to {destination} from {start_date_str} to {end_date_str}"
+        st.session_state.trip_description_key = description_key
 
-    trip_description = f"Planning your trip from {origin} to {destination} from {start_date_str} to {end_date_str}"
+    trip_description = st.session_state.trip_description
     
 else:
     trip_description = f"Please fill the form to get the itinerary!"
 
-st.markdown(f"""<p style="text-align: center; margin: 0.5rem 0 0 0; opacity: 0.9;">{trip_description}</p>""", unsafe_allow_html=True)
+st.markdown(CHATBOT_TRIP_DESCRIPTION.format(trip_description), unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -145,74 +237,78 @@ with st.container(border=True, horizontal_alignment="center"):
     # Process initial prompt only once
     if (initial_prompt and trip_data and not st.session_state.initial_prompt_processed):
         
-        logger.info(f"Processing initial prompt for trip to {trip_data.get('destination')}")
-        logger.debug(f"Initial prompt length: {len(initial_prompt)} characters")
+        logger.info("Processing initial prompt for trip to %s", trip_data.get('destination'))
+        logger.debug("Initial prompt length: %d characters", len(initial_prompt))
         
         # Add Initial prompt in the messages in the session
-        st.session_state.messages.append({"role": "user", "content": initial_prompt})
+        append_message("user", initial_prompt)
         
         # Mark as processed to prevent duplicates
         st.session_state.initial_prompt_processed = True
 
         with st.spinner("Creating your personalized itinerary..."):
             try:
-                model_response = TripSenseAI().generate_initial_plan(trip_data)
+                # Imported here so the Gemini SDK only loads when a plan is requested
+                from services.gemini import get_trip_sense_ai
+                model_response = get_trip_sense_ai().generate_initial_plan(trip_data)
                 
                 # Validate response
                 if model_response and len(model_response.strip()) > 10:  # Ensure meaningful response
-                    st.session_state.messages.append({"role": "assistant", "content": model_response})
+                    append_message("assistant", model_response)
                     # Store this as the main trip itinerary (not follow-up responses)
                     st.session_state.main_trip_itinerary = model_response
-                    logger.info(f"Initial plan response added to messages ({len(model_response)} characters)")
-                    # Force rerun to display the initial response (only if not already rerunning)
-                    if not st.session_state.get('rerunning', False):
-                        st.session_state.rerunning = True
-                        st.rerun()
+                    logger.info("Initial plan response added to messages (%d characters)", len(model_response))
+                    # No rerun needed: render_chat() below displays it in this run
                 else:
                     logger.warning(f"Invalid or empty response from initial plan generation: '{model_response}'")
                     error_msg = "I'm having trouble generating your trip plan right now. Please try refreshing the page or contact support."
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                    append_message("assistant", error_msg)
                     st.error("Failed to generate trip plan. Please try again.")
                     
             except Exception as e:
                 logger.error(f"Exception in initial plan generation: {e}")
                 error_msg = "I encountered an error while generating your trip plan. Please try again."
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                append_message("assistant", error_msg)
                 st.error("An error occurred. Please try again.")
 
-    # Chat interface
-    render_chat()
+    # Chat interface (kept in its own container so new messages render above the input)
+    chat_area = st.container()
+    with chat_area:
+        render_chat()
     
     # Add chat input for user interaction
     if prompt := st.chat_input("Ask me anything about your trip..."):
-        logger.debug(f"User sent message: '{prompt[:50]}{'...' if len(prompt) > 50 else ''}'")
+        logger.debug("User sent message: '%.50s%s'", prompt, '...' if len(prompt) > 50 else '')
         
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        # Add user message to chat history and show it right away
+        new_messages_start = len(st.session_state.messages)
+        append_message("user", prompt)
+        with chat_area:
+            render_chat(new_messages_start)
         
         # Generate AI response
         with st.spinner("Thinking..."):
             try:
-                response = TripSenseAI().chat_response(st.session_state.messages, prompt)
+                from services.gemini import get_trip_sense_ai
+                response = get_trip_sense_ai().chat_response(st.session_state.messages, prompt)
                 
                 # Validate response
                 if response and len(response.strip()) > 5:  # Ensure meaningful response
-                    st.session_state.messages.append({"role": "assistant", "content": response})
-                    logger.debug(f"AI response generated ({len(response)} chars)")
+                    append_message("assistant", response)
+                    logger.debug("AI response generated (%d chars)", len(response))
                 else:
                     logger.warning(f"Invalid or empty chat response")
                     error_msg = "I'm having trouble responding right now. Could you please rephrase your question?"
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                    append_message("assistant", error_msg)
                     
             except Exception as e:
                 logger.error(f"Exception in chat response generation: {e}")
                 error_msg = "I encountered an error processing your message. Please try again."
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                append_message("assistant", error_msg)
         
-        # Rerun to display the new messages (only if not already rerunning)
-        if not st.session_state.get('rerunning', False):
-            st.session_state.rerunning = True
-            st.rerun()
+        # Render the reply in this run instead of triggering a full rerun
+        with chat_area:
+            render_chat(new_messages_start + 1)
 
 # with col2:
 #     # st.map(trip_data)
@@ -228,7 +324,7 @@ with st.container(horizontal_alignment="center", horizontal=True):
          
         try:
             # Validate that we have trip data
-            if not st.session_state.get('trip_data'):
+            if not trip_data:
                 st.error("No trip data to save. Please create a trip plan first.")
             else:
                 # Get the main trip itinerary (not the latest chat response)
@@ -240,23 +336,19 @@ with st.container(horizontal_alignment="center", horizontal=True):
                     logger.info("Using stored main trip itinerary for saving")
                 else:
                     # Fallback: try to find the first substantial AI response (likely the trip plan)
-                    messages = st.session_state.get('messages', [])
-                    ai_responses = [msg['content'] for msg in messages if msg['role'] == 'assistant']
-                    
-                    # Filter out short responses (likely not the main itinerary)
-                    substantial_responses = [resp for resp in ai_responses if len(resp.strip()) > 200]
-                    trip_itinerary = substantial_responses[0] if substantial_responses else (ai_responses[0] if ai_responses else "No detailed itinerary available.")
+                    trip_itinerary = get_fallback_itinerary(st.session_state.get('messages', []))
                     logger.warning("No stored main itinerary found, using fallback method")
                 
                 # Create a default trip name if not provided
-                destination = st.session_state.trip_data.get('destination', 'Unknown Destination')
+                destination = trip_data.get('destination', 'Unknown Destination')
                 default_trip_name = f"Trip to {destination}"
                 
                 # Structure the trip data properly
                 structured_trip_data = {
                     "trip_name": default_trip_name,
                     "trip_summary": f"Trip to {destination} planned with AI assistant",
-                    "form_data": st.session_state.trip_data.copy(),
+                    # No copy needed: trip_data is dropped from session state right after saving
+                    "form_data": trip_data,
                     "itinerary": {
                         "ai_response": trip_itinerary,
                         "demo_mode": False,
@@ -271,7 +363,7 @@ with st.container(horizontal_alignment="center", horizontal=True):
                 st.session_state.saved_trip_data.append(trip_record)
 
                 st.success(f"Trip saved successfully!")
-                logger.info(f"Trip saved with ID: {trip_record.get('trip_id')}")
+                logger.info("Trip saved with ID: %s", trip_record.get('trip_id'))
                 
                 # Clear session state after successful save
                 cleanup_chatbot_session()
@@ -1,38 +1,48 @@
+import calendar
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from styles.styles import (
     FORM_PAGE_HTML
 )
-from services.prompt_loader import render_user_prompt
+from services.prompt_loader import render_user_prompt_cached
+
+SEASONS_BY_MONTH = (
+    None,
+    "Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+    "Summer", "Summer", "Autumn", "Autumn", "Autumn", "Winter",
+)
+
+BUDGET_OPTIONS = ("Low Budget", "Medium Budget", "High Budget")
+BUDGET_INDEX = {option: i for i, option in enumerate(BUDGET_OPTIONS)}
+
+TRAVEL_TYPE_OPTIONS = (
+    "Adventure & Outdoor Activities",
+    "Cultural & Historical Sites",
+    "Relaxation & Wellness",
+    "Food & Culinary Experiences",
+    "Nightlife & Entertainment",
+    "Family-Friendly Activities",
+    "Photography & Sightseeing",
+    "Nature & Wildlife",
+    "Mixed Experience"
+)
+TRAVEL_TYPE_INDEX = {option: i for i, option in enumerate(TRAVEL_TYPE_OPTIONS)}
+
+ACCOMMODATION_OPTIONS = ("Any", "Hotels", "Hostels", "Vacation Rentals", "Resorts", "Boutique Properties")
+ACCOMMODATION_INDEX = {option: i for i, option in enumerate(ACCOMMODATION_OPTIONS)}
 
 def get_season_from_date(date: datetime) -> str:
     """Determine season based on date."""
-    month = date.month
-    if month in [12, 1, 2]:
-        return "Winter"
-    elif month in [3, 4, 5]:
-        return "Spring"
-    elif month in [6, 7, 8]:
-        return "Summer"
-    else:
-        return "Autumn"
+    return SEASONS_BY_MONTH[date.month]
 
 def get_travel_months(start_date: datetime, end_date: datetime) -> list[str]:
     """Get list of travel months between start and end date."""
-    travel_months = []
-    current_date = start_date
-    while current_date <= end_date:
-        month_name = current_date.strftime("%B")
-        if month_name not in travel_months:
-            travel_months.append(month_name)
-        # Move to next month
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-        else:
-            current_date = current_date.replace(month=current_date.month + 1, day=1)
-        if current_date > end_date:
-            break
-    return travel_months
+    first_month = start_date.month - 1
+    span = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    # Spans longer than a year wrap around, so drop repeated month names
+    return list(dict.fromkeys(
+        calendar.month_name[(first_month + i) % 12 + 1] for i in range(span)
+    ))
 
 if "form_data" not in st.session_state:
     st.session_state.form_data = {}
@@ -70,17 +80,20 @@ with st.container(horizontal_alignment="center"):
 
             st.markdown("<br>", unsafe_allow_html=True)
 
-            today = datetime.now()
+            today = date.today()
             
             # Set default dates from form_data if available
             default_start = today
-            default_end = today + timedelta(days=2)
+            default_end = date.fromordinal(today.toordinal() + 2)
             
-            if form_data.get('start_date') and form_data.get('end_date'):
+            stored_start = form_data.get('start_date')
+            stored_end = form_data.get('end_date')
+            if isinstance(stored_start, str) and isinstance(stored_end, str):
                 try:
-                    default_start = datetime.fromisoformat(form_data['start_date']).date()
-                    default_end = datetime.fromisoformat(form_data['end_date']).date()
-                except:
+                    # Stored values come from isoformat(); the date part is the first 10 chars
+                    default_start = date.fromisoformat(stored_start[:10])
+                    default_end = date.fromisoformat(stored_end[:10])
+                except ValueError:
                     pass  # Use default dates if parsing fails
 
             date_range = st.date_input(
@@ -97,16 +110,16 @@ with st.container(horizontal_alignment="center"):
                 end_date = date_range[1]
             elif len(date_range) == 1:
                 start_date = date_range[0]
-                end_date = date_range[0] + timedelta(days=2)
+                end_date = date.fromordinal(start_date.toordinal() + 2)
             else:
                 start_date = today
-                end_date = today + timedelta(days=2)
+                end_date = date.fromordinal(today.toordinal() + 2)
             
             # Ensure end_date is after start_date
             if end_date <= start_date:
-                end_date = start_date + timedelta(days=1)
+                end_date = date.fromordinal(start_date.toordinal() + 1)
             
-            duration = (end_date - start_date).days
+            duration = end_date.toordinal() - start_date.toordinal()
 
             st.markdown("<br>", unsafe_allow_html=True)
 
@@ -122,39 +135,19 @@ with st.container(horizontal_alignment="center"):
                 )
 
             with col2:
-                budget_options = ["Low Budget", "Medium Budget", "High Budget"]
-                budget_index = 1  # Default to Medium
-                if form_data.get('budget') in budget_options:
-                    budget_index = budget_options.index(form_data.get('budget'))
-                
                 budget = st.selectbox(
                     ":material/attach_money: What's your budget?",
-                    options=budget_options,
-                    index=budget_index,
+                    options=BUDGET_OPTIONS,
+                    index=BUDGET_INDEX.get(form_data.get('budget'), 1),  # Default to Medium
                     help="Select your preferred budget range for the trip"
                 )
 
             st.markdown("<br>", unsafe_allow_html=True)
 
-            travel_type_options = [
-                "Adventure & Outdoor Activities",
-                "Cultural & Historical Sites", 
-                "Relaxation & Wellness",
-                "Food & Culinary Experiences",
-                "Nightlife & Entertainment",
-                "Family-Friendly Activities",
-                "Photography & Sightseeing",
-                "Nature & Wildlife",
-                "Mixed Experience"
-            ]
-            travel_type_index = 5  # Default to Mixed Experience
-            if form_data.get('travel_type') in travel_type_options:
-                travel_type_index = travel_type_options.index(form_data.get('travel_type'))
-            
             travel_type = st.selectbox(
                 ":material/travel_explore: What type of experience are you looking for?",
-                options=travel_type_options,
-                index=travel_type_index,
+                options=TRAVEL_TYPE_OPTIONS,
+                index=TRAVEL_TYPE_INDEX.get(form_data.get('travel_type'), TRAVEL_TYPE_INDEX["Mixed Experience"]),
                 help="Choose the type of activities you're most interested in"
             )
 
@@ -162,15 +155,10 @@ with st.container(horizontal_alignment="center"):
 
             st.markdown("<h5>Additional Preferences (Optional)</h5>", unsafe_allow_html=True)
 
-            accommodation_options = ["Any", "Hotels", "Hostels", "Vacation Rentals", "Resorts", "Boutique Properties"]
-            accommodation_index = 0  # Default to Any
-            if form_data.get('accommodation') in accommodation_options:
-                accommodation_index = accommodation_options.index(form_data.get('accommodation'))
-        
             accommodation = st.selectbox(
                 ":material/hotel: Preferred accommodation",
-                options=accommodation_options,
-                index=accommodation_index,
+                options=ACCOMMODATION_OPTIONS,
+                index=ACCOMMODATION_INDEX.get(form_data.get('accommodation'), 0),  # Default to Any
                 help="What type of accommodation do you prefer?"
             )
 
@@ -185,25 +173,31 @@ with st.container(horizontal_alignment="center"):
 
             st.markdown("<br>", unsafe_allow_html=True)
 
-            season = get_season_from_date(start_date)
-            travel_months = get_travel_months(start_date, end_date)
-
-            # Always save form data to session state (for persistence)
-            current_form_data = {
-                "origin": origin,
-                "destination": destination,
-                "duration": duration,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "season": season,
-                "travel_months": travel_months,
-                "travel_type": travel_type,
-                "budget": budget,
-                "group_size": group_size,
-                "accommodation": accommodation,
-                "special_requests": special_requests
-            }
-            st.session_state.form_data = current_form_data
+            form_signature = (
+                origin, destination, start_date, end_date, travel_type,
+                budget, group_size, accommodation, special_requests
+            )
+            cached_form = st.session_state.get('form_data_signature')
+
+            if cached_form and cached_form[0] == form_signature and cached_form[1] is form_data:
+                # Inputs unchanged since the last rerun, reuse the stored form data
+                current_form_data = form_data
+            else:
+                # Save form data to session state (for persistence)
+                current_form_data = {
+                    "origin": origin,
+                    "destination": destination,
+                    "duration": duration,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "travel_type": travel_type,
+                    "budget": budget,
+                    "group_size": group_size,
+                    "accommodation": accommodation,
+                    "special_requests": special_requests
+                }
+                st.session_state.form_data = current_form_data
+                st.session_state.form_data_signature = (form_signature, current_form_data)
 
             with st.container(horizontal=True, horizontal_alignment="center"):
 
@@ -221,8 +215,16 @@ with st.container(horizontal_alignment="center"):
                     elif not destination.strip():
                         st.error("Please enter a destination!")
                     else:
+                        # Season and travel months are only needed once the trip is submitted
+                        season = get_season_from_date(start_date)
+                        travel_months = get_travel_months(start_date, end_date)
+
                         # Store the trip data when submitted
-                        st.session_state.trip_data = current_form_data.copy()
+                        st.session_state.trip_data = {
+                            **current_form_data,
+                            "season": season,
+                            "travel_months": travel_months
+                        }
                                             
                         # Prepare template context
                         context = {
@@ -241,7 +243,7 @@ with st.container(horizontal_alignment="center"):
                         }
                         
                         # Render the prompt using the template
-                        initial_prompt = render_user_prompt(context)
+                        initial_prompt = render_user_prompt_cached(context)
                         
                         # Store the initial prompt for future use
                         st.session_state.initial_prompt = initial_prompt
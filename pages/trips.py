@@ -1,17 +1,78 @@
 import streamlit as st
 from services.logging import logger
 from services.firebase_auth import get_user_id
-from datetime import datetime
+import hashlib
+import json
 import re
-from services.export import generate_trip_pdf
-from services.trip_storage import list_trips, load_trip, delete_trip
+from services.prompt_loader import render_user_prompt
+from services.trip_storage import list_trips, load_trip, delete_trip, format_display_date
 from styles.styles import TRIPS_HEADER
 
+TRIPS_PAGE_SIZE = 20
+
+# Trip card templates, filled from the list_trips summaries (which always carry these keys)
+TRIP_CARD_DETAILS = (
+    "**:material/map: From:** {origin}\n\n"
+    "**:material/pin_drop: To:** {destination}\n\n"
+    "**:material/calendar_month: Duration:** {start_date} to {end_date}"
+).format_map
+TRIP_CARD_SUMMARY = "\n\n**:material/description: Summary:** {}".format
+TRIP_CARD_STATS = (
+    "**:material/bookmark: {label}:** {created}\n\n"
+    "**:material/group: Travelers:** {group_size}\n\n"
+    "**:material/payments: Budget:** {budget}\n\n"
+    "**:material/travel_explore: Type:** {travel_type}"
+).format
+
+UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\s-]')
+FILENAME_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+def trip_content_hash(trip_data):
+    """Short digest of the trip contents, used to key the cached PDF."""
+    payload = json.dumps(trip_data, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+# cache_resource hands back the same immutable bytes object on every hit,
+# where cache_data would unpickle a fresh copy of the PDF on each rerun
+@st.cache_resource(max_entries=32, ttl=3600, show_spinner=False)
+def render_trip_pdf(trip_id, content_hash, _trip_data, _form_data, _itinerary, trip_name) -> bytes:
+    """Render the trip PDF once per trip content and reuse the bytes across reruns."""
+    # Imported here so reportlab is only loaded once a PDF is actually requested
+    from services.export import generate_trip_pdf
+    
+    pdf_buffer = generate_trip_pdf(_trip_data, _form_data, _itinerary, trip_name, trip_id)
+    if pdf_buffer is None:
+        raise Exception("PDF generation returned None")
+    
+    # Check the size on the buffer view before taking the single copy out of it
+    if pdf_buffer.getbuffer().nbytes == 0:
+        raise Exception("Generated PDF is empty")
+    return pdf_buffer.getvalue()
+
+def build_trip_view(trip_id, full_trip):
+    """Pull the fields the trip modal renders out of a stored trip record."""
+    trip_data = full_trip.get('trip_data', {})
+    form_data = trip_data.get('form_data', {})
+    trip_name = trip_data.get('trip_name', 'Untitled Trip')
+    travel_months = form_data.get('travel_months')
+    safe_trip_name = FILENAME_SEPARATORS_RE.sub('-', UNSAFE_FILENAME_CHARS_RE.sub('', trip_name).strip())
+    return {
+        'trip_data': trip_data,
+        'form_data': form_data,
+        'itinerary': trip_data.get('itinerary', {}),
+        'trip_name': trip_name,
+        'origin': form_data.get('origin', 'Unknown Origin'),
+        'destination': form_data.get('destination', 'Unknown Destination'),
+        'special_requests': form_data.get('special_requests', '').strip(),
+        'travel_months': ', '.join(travel_months) if isinstance(travel_months, list) else (travel_months or 'N/A'),
+        'content_hash': trip_content_hash(trip_data),
+        'pdf_filename': f"{safe_trip_name}_{trip_id[:8]}.pdf"
+    }
+
 @st.dialog(title="Trip Details", width="large")
-def show_trip_modal(trip_id):
+def show_trip_modal(trip_id, user_id):
     """Display trip details in a modal popup"""
     # Load full trip data using the proper function
-    user_id = get_user_id()
     full_trip = load_trip(trip_id, user_id=user_id)
     
     if not full_trip:
@@ -22,14 +83,23 @@ def show_trip_modal(trip_id):
             st.rerun()
         return
     
-    trip_data = full_trip.get('trip_data', {})
-    form_data = trip_data.get('form_data', {})
-    itinerary = trip_data.get('itinerary', {})
+    # Extract the displayed fields once per opened trip, not on every modal rerun.
+    # A single key holds the latest trip's view, so leaving the modal any way leaves one entry at most.
+    cached_view = st.session_state.get("trip_modal_view")
+    if cached_view and cached_view[0] == trip_id and cached_view[1] is full_trip:
+        view = cached_view[2]
+    else:
+        view = build_trip_view(trip_id, full_trip)
+        st.session_state.trip_modal_view = (trip_id, full_trip, view)
+    
+    trip_data = view['trip_data']
+    form_data = view['form_data']
+    itinerary = view['itinerary']
     
     # Trip header with name and destination
-    trip_name = trip_data.get('trip_name', 'Untitled Trip')
-    origin = form_data.get('origin', 'Unknown Origin')
-    destination = form_data.get('destination', 'Unknown Destination')
+    trip_name = view['trip_name']
+    origin = view['origin']
+    destination = view['destination']
     is_booked = full_trip.get('is_booked', False)
     
     st.markdown(f"### :material/map: {trip_name}")
@@ -38,11 +108,10 @@ def show_trip_modal(trip_id):
     if is_booked:
         booked_date = full_trip.get('booked_at', '')
         if booked_date:
-            try:
-                date_obj = datetime.fromisoformat(booked_date.replace('Z', '+00:00'))
-                formatted_date = date_obj.strftime("%B %d, %Y")
+            formatted_date = format_display_date(booked_date)
+            if formatted_date:
                 st.success(f":material/check_circle: Trip Booked on {formatted_date}")
-            except:
+            else:
                 st.success(":material/check_circle: Trip Booked")
     
     st.markdown(f"**From:** {origin}")
@@ -58,28 +127,28 @@ def show_trip_modal(trip_id):
         with col1:
             start_date = form_data.get('start_date', 'N/A')
             end_date = form_data.get('end_date', 'N/A')
-            st.write(f"**Travel Dates:** {start_date} to {end_date}")
-
-            st.write(f"**Group Details:** {form_data.get('group_size', 'N/A')} people")
-            st.write(f"**Type:** {form_data.get('travel_type', 'N/A')}")
-            
-            st.write(f"**Budget:** {form_data.get('budget', 'N/A')}")
-            st.write(f"**Stay:** {form_data.get('accommodation', 'N/A')}")
+            # One markdown block per column instead of a write per line
+            st.markdown(
+                f"**Travel Dates:** {start_date} to {end_date}\n\n"
+                f"**Group Details:** {form_data.get('group_size', 'N/A')} people\n\n"
+                f"**Type:** {form_data.get('travel_type', 'N/A')}\n\n"
+                f"**Budget:** {form_data.get('budget', 'N/A')}\n\n"
+                f"**Stay:** {form_data.get('accommodation', 'N/A')}"
+            )
         
         with col2:
-            st.write(f"**Season:** {form_data.get('season', 'N/A')}")
-            if isinstance(form_data.get('travel_months', 'N/A'), list):
-                travel_months = ', '.join(form_data.get('travel_months', 'N/A'))
-            st.write(f"**Months:** {travel_months}")
-
-            st.write(f"**Duration:** {form_data.get('duration', 'N/A')} days")
-            
-            st.write(f"**Trip Summary:** {trip_data.get('trip_summary', 'No summary provided')}")
+            overview = (
+                f"**Season:** {form_data.get('season', 'N/A')}\n\n"
+                f"**Months:** {view['travel_months']}\n\n"
+                f"**Duration:** {form_data.get('duration', 'N/A')} days\n\n"
+                f"**Trip Summary:** {trip_data.get('trip_summary', 'No summary provided')}"
+            )
             
             # Special requests if any
-            special_requests = form_data.get('special_requests', '').strip()
+            special_requests = view['special_requests']
             if special_requests:
-                st.write(f"**Special Requests:** {special_requests}")
+                overview += f"\n\n**Special Requests:** {special_requests}"
+            st.markdown(overview)
 
     with tab2:
         # Show itinerary
@@ -106,7 +175,6 @@ def show_trip_modal(trip_id):
             st.session_state.trip_data = form_data.copy()
             
             # Generate new initial prompt from the form data
-            from services.prompt_loader import render_user_prompt
             context = {
                 'origin': form_data.get('origin', ''),
                 'destination': form_data.get('destination', ''),
@@ -118,7 +186,7 @@ def show_trip_modal(trip_id):
                 'budget': form_data.get('budget', ''),
                 'group_size': form_data.get('group_size', ''),
                 'accommodation': form_data.get('accommodation', ''),
-                'special_requests': form_data.get('special_requests', '').strip() if form_data.get('special_requests', '').strip() else None
+                'special_requests': view['special_requests'] or None
             }
             st.session_state.initial_prompt = render_user_prompt(context)
             
@@ -141,85 +209,54 @@ def show_trip_modal(trip_id):
             st.switch_page("pages/form.py")
     
     with col3:
-        # PDF Download/Generate button
-        pdf_key = f"pdf_ready_{trip_id}"
+        # PDF Download/Generate button; the bytes live in the render_trip_pdf cache
+        pdf_ready_trips = st.session_state.setdefault('pdf_ready_trips', set())
+        content_hash = view['content_hash']
+        filename = view['pdf_filename']
         
-        # Check if PDF is already generated for this trip and data is valid
-        pdf_data_valid = False
-        if st.session_state.get(pdf_key):
-            try:
-                # Verify the PDF data is still accessible and valid
-                pdf_info = st.session_state[pdf_key]
-                if pdf_info.get('data') and len(pdf_info['data']) > 0:
-                    pdf_data_valid = True
-            except (KeyError, TypeError, AttributeError):
-                # Clean up corrupted PDF data
-                st.session_state.pop(pdf_key, None)
-                pdf_data_valid = False
+        # The generate button is swapped for the download button in the same run
+        pdf_slot = st.empty()
         
-        if pdf_data_valid:
-            # Show download button for ready PDF
-            try:
-                st.download_button(
-                    label=":material/download: Download PDF",
-                    data=st.session_state[pdf_key]['data'],
-                    file_name=st.session_state[pdf_key]['filename'],
-                    mime="application/pdf",
-                    type="primary",
-                    use_container_width=True,
-                    key=f"download_pdf_{trip_id}"  # Unique key to prevent conflicts
-                )
-            except Exception as e:
-                # If download fails, clear the corrupted data and show generate button
-                logger.warning(f"PDF download failed for trip {trip_id}: {e}")
-                st.session_state.pop(pdf_key, None)
-                st.error("PDF file is no longer available. Please generate a new one.")
-                pdf_data_valid = False
-        
-        if not pdf_data_valid:
+        if trip_id not in pdf_ready_trips:
             # Show generate button
-            if st.button(":material/download: Generate PDF", use_container_width=True, key=f"generate_pdf_{trip_id}"):
+            if pdf_slot.button(":material/download: Generate PDF", use_container_width=True, key=f"generate_pdf_{trip_id}"):
                 try:
                     with st.spinner("Generating PDF..."):
                         logger.info(f"Starting PDF generation for trip: {trip_name} (ID: {trip_id})")
-                        pdf_buffer = generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id)
-                        
-                        if pdf_buffer is None:
-                            raise Exception("PDF generation returned None")
-                        
-                        # Create filename
-                        safe_trip_name = re.sub(r'[^\w\s-]', '', trip_name).strip()
-                        safe_trip_name = re.sub(r'[-\s]+', '-', safe_trip_name)
-                        filename = f"{safe_trip_name}_{trip_id[:8]}.pdf"
-                        
-                        # Get PDF data
-                        pdf_data = pdf_buffer.getvalue()
-                        if len(pdf_data) == 0:
-                            raise Exception("Generated PDF is empty")
-                        
-                        # Store PDF data in session state with validation
-                        st.session_state[pdf_key] = {
-                            'data': pdf_data,
-                            'filename': filename,
-                            'generated_at': datetime.now().isoformat()  # Add timestamp for debugging
-                        }
+                        pdf_data = render_trip_pdf(trip_id, content_hash, trip_data, form_data, itinerary, trip_name)
+                        pdf_ready_trips.add(trip_id)
                         
                         logger.info(f"PDF generated successfully: {filename} ({len(pdf_data)} bytes)")
                         st.success(f"PDF generated successfully! ({len(pdf_data):,} bytes)")
-                        st.rerun()
                         
                 except Exception as e:
                     logger.error(f"Error generating PDF for trip {trip_id}: {e}")
                     st.error(f"Unable to generate PDF: {str(e)}")
-                    # Clear any partial data
-                    st.session_state.pop(pdf_key, None)
+        
+        if trip_id in pdf_ready_trips:
+            # Show download button for ready PDF
+            try:
+                pdf_slot.download_button(
+                    label=":material/download: Download PDF",
+                    data=render_trip_pdf(trip_id, content_hash, trip_data, form_data, itinerary, trip_name),
+                    file_name=filename,
+                    mime="application/pdf",
+                    type="primary",
+                    use_container_width=True,
+                    key=f"download_pdf_{trip_id}"  # Unique key to prevent conflicts
+                )
+            except Exception as e:
+                logger.warning(f"PDF download failed for trip {trip_id}: {e}")
+                pdf_ready_trips.discard(trip_id)
+                st.error("PDF file is no longer available. Please generate a new one.")
     
     with col4:
         # Generate New button (only show if PDF is ready)
-        if st.session_state.get(pdf_key):
+        if trip_id in pdf_ready_trips:
             if st.button(":material/refresh: Generate New", use_container_width=True, key=f"regenerate_{trip_id}"):
-                st.session_state.pop(pdf_key, None)
-                st.rerun()
+                pdf_ready_trips.discard(trip_id)
+                render_trip_pdf.clear(trip_id, content_hash, trip_data, form_data, itinerary, trip_name)
+                st.rerun(scope="fragment")
         else:
             # Empty space when no PDF is generated
             st.write("")
@@ -228,39 +265,94 @@ def show_trip_modal(trip_id):
         if st.button(":material/close: Close", use_container_width=True):
             st.session_state.show_trip_modal = False
             st.session_state.selected_trip_id = None
-            # Clean up any PDF data for this trip to prevent memory leaks
-            pdf_key = f"pdf_ready_{trip_id}"
-            st.session_state.pop(pdf_key, None)
+            pdf_ready_trips.discard(trip_id)
+            st.session_state.pop("trip_modal_view", None)
             st.rerun()
 
-# Initialize session state for trips page
-def initialize_trips_session():
-    """Initialize trips page session state and prevent unwanted regeneration"""
-    # Clean up any stale PDF data that might cause media file errors
-    cleanup_stale_pdf_data()
+def paginate_trips(trips, key):
+    """Return the page of trips to render, showing a page picker only when needed."""
+    page_count = -(-len(trips) // TRIPS_PAGE_SIZE)
+    if page_count <= 1:
+        return trips
+    
+    # Seed the widget through session state only, then keep the page in range after deletes
+    if st.session_state.setdefault(key, 1) > page_count:
+        st.session_state[key] = page_count
+    page = st.number_input("Page", min_value=1, max_value=page_count, key=key)
+    start = (page - 1) * TRIPS_PAGE_SIZE
+    return trips[start:start + TRIPS_PAGE_SIZE]
 
-def cleanup_stale_pdf_data():
-    """Clean up stale PDF data from session state to prevent media file errors"""
-    try:
-        # Find all PDF keys in session state
-        pdf_keys_to_remove = []
-        for key in st.session_state.keys():
-            if key.startswith('pdf_ready_'):
-                try:
-                    # Try to access the PDF data to see if it's still valid
-                    pdf_info = st.session_state[key]
-                    if not pdf_info.get('data') or len(pdf_info['data']) == 0:
-                        pdf_keys_to_remove.append(key)
-                except (KeyError, TypeError, AttributeError):
-                    pdf_keys_to_remove.append(key)
+def render_trip_card(trip, user_id, booked):
+    """Render one saved or booked trip card with its action buttons."""
+    trip_id = trip.get('trip_id')
+    # Booked cards keep their own widget keys so they never clash with saved ones
+    key_prefix = "booked_" if booked else ""
+    
+    with st.container(border=True):
         
-        # Remove stale PDF data
-        for key in pdf_keys_to_remove:
-            st.session_state.pop(key, None)
-            logger.info(f"Cleaned up stale PDF data: {key}")
+        trip_name = trip.get('trip_name', 'Untitled Trip')
+        if booked:
+            st.subheader(f":material/flight: {trip_name}")
             
-    except Exception as e:
-        logger.warning(f"Error during PDF cleanup: {e}")
+            # Show booking badge
+            if trip.get('booked_at'):
+                formatted_date = trip['booked_at_display']
+                if formatted_date:
+                    st.success(f":material/celebration: Booked on {formatted_date}")
+                else:
+                    st.success(":material/celebration: Booked")
+        else:
+            st.subheader(f"{trip_name}")
+
+        col1, col2, col3 = st.columns([3, 2, 1])
+
+        with col1:
+            details = TRIP_CARD_DETAILS(trip)
+            trip_summary = trip.get('trip_summary')
+            if trip_summary:
+                details += TRIP_CARD_SUMMARY(trip_summary)
+            st.markdown(details)
+        
+        with col2:
+            created_date = trip.get('created_at')
+            if created_date:
+                formatted_date = trip['created_at_display'] or created_date[:10]
+                label = "Created" if booked else "Saved"
+                st.markdown(TRIP_CARD_STATS(label=label, created=formatted_date, **trip))
+                        
+        with col3:
+            if st.button(":material/view_list: View Details", key=f"view_{key_prefix}{trip_id}"):
+                st.session_state.selected_trip_id = trip_id
+                st.session_state.show_trip_modal = True
+                st.rerun()
+
+            # Only show Book button for unbooked trips
+            if not booked:
+                if st.button(":material/paid: Book Trip", key=f"book_{trip_id}", type="primary"):
+                    # Set the trip to book and navigate to booking page
+                    st.session_state.selected_booking_trip = trip_id
+                    st.session_state.show_trip_modal = False
+                    st.session_state.selected_trip_id = None
+                    st.switch_page("pages/book.py")
+            
+            if st.button(":material/delete: Delete", key=f"delete_{key_prefix}{trip_id}"):
+                # Delete trip from both Firestore and session state
+                if delete_trip(trip_id, user_id):
+                    st.success("Trip deleted!")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete trip")
+
+@st.fragment
+def render_trip_list(trips, user_id, booked):
+    """Render one page of trip cards; paging through the list reruns only this section."""
+    page_key = "booked_trips_page" if booked else "saved_trips_page"
+    for trip in paginate_trips(trips, page_key):
+        render_trip_card(trip, user_id, booked=booked)
+
+# Initialize session state for trips page
+def initialize_trips_session():
+    """Initialize trips page session state and prevent unwanted regeneration"""
     # Only initialize once per session to prevent duplicate operations
     if st.session_state.get('trips_page_initialized'):
         return
@@ -293,8 +385,9 @@ try:
     all_trips = list_trips(user_id=user_id)
     
     # Separate trips into saved and booked
-    saved_trips = [trip for trip in all_trips if not trip.get('is_booked', False)]
-    booked_trips = [trip for trip in all_trips if trip.get('is_booked', False)]
+    saved_trips, booked_trips = [], []
+    for trip in all_trips:
+        (booked_trips if trip.get('is_booked', False) else saved_trips).append(trip)
     
     if not all_trips:
         st.warning("No saved trips yet. Create a trip and save it to see it here!")
@@ -313,59 +406,7 @@ try:
             st.markdown("---")
             
             # Display saved trips
-            for trip in saved_trips:
-                with st.container(border=True):                
-                    
-                    trip_name = trip.get('trip_name', 'Untitled Trip')
-                    st.subheader(f"{trip_name}")
-
-                    col1, col2, col3 = st.columns([3, 2, 1])
-
-                    with col1:
-                        st.write(f"**:material/map: From:** {trip.get('origin', 'Unknown')}")
-                        st.write(f"**:material/pin_drop: To:** {trip.get('destination', 'Unknown')}")
-                        st.write(f"**:material/calendar_month: Duration:** {trip.get('start_date', 'N/A')} to {trip.get('end_date', 'N/A')}")
-                        if trip.get('trip_summary'):
-                            st.write(f"**:material/description: Summary:** {trip.get('trip_summary')}")
-                    
-                    with col2:
-                        created_date = trip.get('created_at', '')
-                        if created_date:
-                            try:
-                                date_obj = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                                formatted_date = date_obj.strftime("%B %d, %Y")
-                                st.write(f"**:material/bookmark: Saved:** {formatted_date}")
-                            except:
-                                st.write(f"**:material/bookmark: Saved:** {created_date[:10]}")
-                        
-                            st.write(f"**:material/group: Travelers:** {trip.get('group_size', 'N/A')}")
-                            st.write(f"**:material/payments: Budget:** {trip.get('budget', 'N/A')}")
-                            st.write(f"**:material/travel_explore: Type:** {trip.get('travel_type', 'N/A')}")
-                                    
-                    with col3:
-                        if st.button(":material/view_list: View Details", key=f"view_{trip.get('trip_id')}"):
-                            st.session_state.selected_trip_id = trip.get('trip_id')
-                            st.session_state.show_trip_modal = True
-                            st.rerun()
-
-                        # Only show Book button for unbooked trips
-                        if not trip.get('is_booked', False):
-                            if st.button(":material/paid: Book Trip", key=f"book_{trip.get('trip_id')}", type="primary"):
-                                # Set the trip to book and navigate to booking page
-                                st.session_state.selected_booking_trip = trip.get('trip_id')
-                                st.session_state.show_trip_modal = False
-                                st.session_state.selected_trip_id = None
-                                st.switch_page("pages/book.py")
-                        
-                        if st.button(":material/delete: Delete", key=f"delete_{trip.get('trip_id')}"):
-                            # Delete trip from both Firestore and session state
-                            trip_id = trip.get('trip_id')
-                            user_id = get_user_id()
-                            if delete_trip(trip_id, user_id):
-                                st.success("Trip deleted!")
-                                st.rerun()
-                            else:
-                                st.error("Failed to delete trip")
+            render_trip_list(saved_trips, user_id, booked=False)
             
             st.markdown("<br>", unsafe_allow_html=True)
 
@@ -376,66 +417,13 @@ try:
             st.markdown("---")
             
             # Display booked trips
-            for trip in booked_trips:
-                with st.container(border=True):                
-                    
-                    trip_name = trip.get('trip_name', 'Untitled Trip')
-                    st.subheader(f":material/flight: {trip_name}")
-                    
-                    # Show booking badge
-                    booked_date = trip.get('booked_at', '')
-                    if booked_date:
-                        try:
-                            date_obj = datetime.fromisoformat(booked_date.replace('Z', '+00:00'))
-                            formatted_date = date_obj.strftime("%B %d, %Y")
-                            st.success(f":material/celebration: Booked on {formatted_date}")
-                        except:
-                            st.success(":material/celebration: Booked")
-
-                    col1, col2, col3 = st.columns([3, 2, 1])
-
-                    with col1:
-                        st.write(f"**:material/map: From:** {trip.get('origin', 'Unknown')}")
-                        st.write(f"**:material/pin_drop: To:** {trip.get('destination', 'Unknown')}")
-                        st.write(f"**:material/calendar_month: Duration:** {trip.get('start_date', 'N/A')} to {trip.get('end_date', 'N/A')}")
-                        if trip.get('trip_summary'):
-                            st.write(f"**:material/description: Summary:** {trip.get('trip_summary')}")
-                    
-                    with col2:
-                        created_date = trip.get('created_at', '')
-                        if created_date:
-                            try:
-                                date_obj = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                                formatted_date = date_obj.strftime("%B %d, %Y")
-                                st.write(f"**:material/bookmark: Created:** {formatted_date}")
-                            except:
-                                st.write(f"**:material/bookmark: Created:** {created_date[:10]}")
-                        
-                            st.write(f"**:material/group: Travelers:** {trip.get('group_size', 'N/A')}")
-                            st.write(f"**:material/payments: Budget:** {trip.get('budget', 'N/A')}")
-                            st.write(f"**:material/travel_explore: Type:** {trip.get('travel_type', 'N/A')}")
-                                    
-                    with col3:
-                        if st.button(":material/view_list: View Details", key=f"view_booked_{trip.get('trip_id')}"):
-                            st.session_state.selected_trip_id = trip.get('trip_id')
-                            st.session_state.show_trip_modal = True
-                            st.rerun()
-                        
-                        if st.button(":material/delete: Delete", key=f"delete_booked_{trip.get('trip_id')}"):
-                            # Delete trip from both Firestore and session state
-                            trip_id = trip.get('trip_id')
-                            user_id = get_user_id()
-                            if delete_trip(trip_id, user_id):
-                                st.success("Trip deleted!")
-                                st.rerun()
-                            else:
-                                st.error("Failed to delete trip")
+            render_trip_list(booked_trips, user_id, booked=True)
             
             st.markdown("<br>", unsafe_allow_html=True)
         
         # Show trip details modal if selected
         if st.session_state.get('show_trip_modal') and st.session_state.get('selected_trip_id'):
-            show_trip_modal(st.session_state.selected_trip_id)
+            show_trip_modal(st.session_state.selected_trip_id, user_id)
                 
 except Exception as e:
     st.error(f"Error loading saved trips: {e}")
@@ -2,9 +2,12 @@
 Airport code mapping and lookup service.
 Helps convert city names to airport codes for SerpAPI.
 """
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 
-# Common city to airport code mappings
-CITY_TO_AIRPORT = {
+# Common city to airport code mappings (read-only, shared by every session)
+CITY_TO_AIRPORT = MappingProxyType({
     # India
     "chennai": "MAA",
     "mumbai": "BOM",
@@ -220,8 +223,52 @@ CITY_TO_AIRPORT = {
     "usa": "JFK",  # New York
     "united states": "JFK",
     "india": "DEL",  # Delhi
-}
+})
 
+# Every airport code the mapping can produce, for the already-a-code fast path
+AIRPORT_CODES = frozenset(CITY_TO_AIRPORT.values())
+
+# Popular airports by region as (city, code) pairs
+POPULAR_AIRPORTS = MappingProxyType({
+    "India": (
+        ("Delhi", "DEL"),
+        ("Mumbai", "BOM"),
+        ("Bangalore", "BLR"),
+        ("Chennai", "MAA"),
+        ("Kolkata", "CCU"),
+        ("Hyderabad", "HYD"),
+        ("Goa", "GOI"),
+    ),
+    "USA": (
+        ("New York", "JFK"),
+        ("Los Angeles", "LAX"),
+        ("Chicago", "ORD"),
+        ("San Francisco", "SFO"),
+        ("Miami", "MIA"),
+        ("Boston", "BOS"),
+        ("Las Vegas", "LAS"),
+    ),
+    "Europe": (
+        ("London", "LHR"),
+        ("Paris", "CDG"),
+        ("Amsterdam", "AMS"),
+        ("Frankfurt", "FRA"),
+        ("Madrid", "MAD"),
+        ("Rome", "FCO"),
+        ("Barcelona", "BCN"),
+    ),
+    "Asia": (
+        ("Dubai", "DXB"),
+        ("Singapore", "SIN"),
+        ("Tokyo", "NRT"),
+        ("Bangkok", "BKK"),
+        ("Hong Kong", "HKG"),
+        ("Seoul", "ICN"),
+        ("Kuala Lumpur", "KUL"),
+    )
+})
+
+@lru_cache(maxsize=256)
 def get_airport_code(location: str) -> tuple[str, str]:
     """
     Convert location name to airport code.
@@ -241,8 +288,10 @@ def get_airport_code(location: str) -> tuple[str, str]:
     location_clean = location.strip()
     location_lower = location_clean.lower()
     
-    # Check if it's already an airport code (3 uppercase letters)
-    if len(location_clean) == 3 and location_clean.isupper() and location_clean.isalpha():
+    # Check if it's already an airport code (a known code, or any 3 uppercase letters)
+    if location_clean in AIRPORT_CODES or (
+        len(location_clean) == 3 and location_clean.isupper() and location_clean.isalpha()
+    ):
         return (location_clean, location_clean)
     
     # Try to find in mapping
@@ -270,49 +319,11 @@ def format_location_display(airport_code: str, city_name: str = None) -> str:
         return f"{airport_code} ({city_name})"
     return airport_code
 
-def get_popular_airports() -> dict[str, list[tuple[str, str]]]:
+def get_popular_airports() -> Mapping[str, tuple[tuple[str, str], ...]]:
     """
     Get popular airports by region.
     
     Returns:
-        Dict of region -> list of (city, code) tuples
+        Read-only mapping of region -> tuple of (city, code) tuples
     """
-    return {
-        "India": [
-            ("Delhi", "DEL"),
-            ("Mumbai", "BOM"),
-            ("Bangalore", "BLR"),
-            ("Chennai", "MAA"),
-            ("Kolkata", "CCU"),
-            ("Hyderabad", "HYD"),
-            ("Goa", "GOI"),
-        ],
-        "USA": [
-            ("New York", "JFK"),
-            ("Los Angeles", "LAX"),
-            ("Chicago", "ORD"),
-            ("San Francisco", "SFO"),
-            ("Miami", "MIA"),
-            ("Boston", "BOS"),
-            ("Las Vegas", "LAS"),
-        ],
-        "Europe": [
-            ("London", "LHR"),
-            ("Paris", "CDG"),
-            ("Amsterdam", "AMS"),
-            ("Frankfurt", "FRA"),
-            ("Madrid", "MAD"),
-            ("Rome", "FCO"),
-            ("Barcelona", "BCN"),
-        ],
-        "Asia": [
-            ("Dubai", "DXB"),
-            ("Singapore", "SIN"),
-            ("Tokyo", "NRT"),
-            ("Bangkok", "BKK"),
-            ("Hong Kong", "HKG"),
-            ("Seoul", "ICN"),
-            ("Kuala Lumpur", "KUL"),
-        ]
-    }
-
+    return POPULAR_AIRPORTS
@@ -7,94 +7,200 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from datetime import datetime
 
+# Markdown -> ReportLab markup patterns, compiled once at import;
+# links, bold, italic and code are converted in a single left-to-right pass.
+# Italics may wrap a **bold** run, so a '**' inside them never ends the match.
+INLINE_MARKDOWN_RE = re.compile(
+    r'\[(?P<link_text>[^\]]+)\]\((?P<url>[^\)]+)\)'
+    r'|\*\*(?P<bold>.*?)\*\*'
+    r'|\*(?P<italic>(?:\*\*.*?\*\*|[^*\n])+)\*'
+    r'|`(?P<code>.*?)`'
+)
+BULLET_MARKER_RE = re.compile(r'^\s*[\*\-\+]\s+', re.MULTILINE)
+EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Characters any of the patterns above needs before it can match
+MARKDOWN_CHARS = frozenset('*-+[`')
+
+# Itinerary line parsing patterns
+TIME_PREFIX_RE = re.compile(r'^(\d{1,2}:\d{2}\s*[AP]M)')
+DAY_NUMBER_RE = re.compile(r'day\s+(\d+)')
+# '### ' heading keywords and the section each starts, checked in priority order
+SECTION_KEYWORDS = (
+    ('flight', 'flights'),
+    ('day', 'daily_itinerary'),
+    ('practical', 'practical_tips'),
+    ('budget', 'budget'),
+    ('seasonal', 'seasonal'),
+    ('creative', 'creative'),
+)
+# Classifies each non-blank itinerary line in one pass; group names pick the style
+# and the surrounding whitespace is left outside the groups, so lines need no strip()
+LINE_CLASSIFIER_RE = re.compile(
+    r'^[^\S\n]*(?:(?P<sub_heading>###.*?)'
+    r'|(?P<heading>##.*?)'
+    r'|(?P<title>#.*?)'
+    r'|(?P<bullet>[\*\-•].*?)'
+    r'|(?P<text>\S.*?))[^\S\n]*$',
+    re.MULTILINE
+)
+
+MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+# Page geometry shared by every export
+PDF_PAGE_LAYOUT = {
+    'pagesize': A4,
+    'rightMargin': 72,
+    'leftMargin': 72,
+    'topMargin': 72,
+    'bottomMargin': 18
+}
+
+# Theme colours, parsed once at import
+PRIMARY_COLOR = colors.HexColor('#2E86AB')
+ACCENT_COLOR = colors.HexColor('#A23B72')
+TABLE_LABEL_COLOR = colors.HexColor('#F0F8FF')
+META_LABEL_COLOR = colors.HexColor('#F5F5F5')
+
+# Paragraph styles never depend on the trip, so build them once at import
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    textColor=PRIMARY_COLOR,
+    alignment=1
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=16,
+    spaceAfter=12,
+    textColor=ACCENT_COLOR,
+    spaceBefore=20
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=11,
+    spaceAfter=6,
+    leading=14
+)
+
+SUB_HEADING_STYLE = ParagraphStyle(
+    'SubHeading',
+    parent=HEADING_STYLE,
+    fontSize=14,
+    spaceAfter=14,
+    spaceBefore=15,
+    textColor=PRIMARY_COLOR
+)
+
+TIME_STYLE = ParagraphStyle(
+    'TimeStyle',
+    parent=NORMAL_STYLE,
+    leftIndent=20,
+    bulletIndent=10,
+    spaceAfter=7,
+    fontSize=10,
+    textColor=ACCENT_COLOR
+)
+
+BULLET_STYLE = ParagraphStyle(
+    'BulletStyle',
+    parent=NORMAL_STYLE,
+    leftIndent=20,
+    bulletIndent=10,
+    spaceAfter=7
+)
+
+# Itinerary variants of the shared styles, carrying the extra gap that used to
+# be a separate Spacer after every line
+ITINERARY_TITLE_STYLE = ParagraphStyle('ItineraryTitle', parent=TITLE_STYLE, spaceAfter=40)
+ITINERARY_HEADING_STYLE = ParagraphStyle('ItineraryHeading', parent=HEADING_STYLE, spaceAfter=20)
+ITINERARY_TEXT_STYLE = ParagraphStyle('ItineraryText', parent=NORMAL_STYLE, spaceAfter=10)
+
+# Table styles for the overview and metadata tables
+TRIP_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), TABLE_LABEL_COLOR),
+    ('TEXTCOLOR', (0, 0), (0, -1), PRIMARY_COLOR),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+META_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), META_LABEL_COLOR),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+
+def format_generated_at(moment):
+    """Format a datetime like strftime("%B %d, %Y at %I:%M %p") without the locale lookups"""
+    meridiem = 'AM' if moment.hour < 12 else 'PM'
+    return (
+        f"{MONTH_NAMES[moment.month - 1]} {moment.day:02d}, {moment.year} "
+        f"at {(moment.hour - 1) % 12 + 1:02d}:{moment.minute:02d} {meridiem}"
+    )
+
 def generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id):
     """Generate a PDF document for the trip"""
     buffer = io.BytesIO()
     
     # Create PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=18
-    )
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        textColor=colors.HexColor('#2E86AB'),
-        alignment=1
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.HexColor('#A23B72'),
-        spaceBefore=20
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=6,
-        leading=14
-    )
+    doc = SimpleDocTemplate(buffer, **PDF_PAGE_LAYOUT)
     
     # Build PDF content
     story = []
     
     # Title
-    story.append(Paragraph(f"🗺️ {trip_name}", title_style))
+    story.append(Paragraph(f"🗺️ {trip_name}", TITLE_STYLE))
     story.append(Spacer(1, 20))
     
     # Trip Overview Section
-    story.append(Paragraph("📋 Trip Overview", heading_style))
+    story.append(Paragraph("📋 Trip Overview", HEADING_STYLE))
     
     # Create trip details table
+    form_field = form_data.get
     trip_details = [
-        ['Destination:', form_data.get('destination', 'N/A')],
-        ['Travel Dates:', f"{form_data.get('start_date', 'N/A')} to {form_data.get('end_date', 'N/A')}"],
-        ['Duration:', f"{form_data.get('duration', 'N/A')} days"],
-        ['Group Size:', f"{form_data.get('group_size', 'N/A')} people"],
-        ['Travel Type:', form_data.get('travel_type', 'N/A')],
-        ['Budget:', form_data.get('budget', 'N/A')],
-        ['Accommodation:', form_data.get('accommodation', 'N/A')],
-        ['Season:', form_data.get('season', 'N/A')],
+        ['Destination:', form_field('destination', 'N/A')],
+        ['Travel Dates:', f"{form_field('start_date', 'N/A')} to {form_field('end_date', 'N/A')}"],
+        ['Duration:', f"{form_field('duration', 'N/A')} days"],
+        ['Group Size:', f"{form_field('group_size', 'N/A')} people"],
+        ['Travel Type:', form_field('travel_type', 'N/A')],
+        ['Budget:', form_field('budget', 'N/A')],
+        ['Accommodation:', form_field('accommodation', 'N/A')],
+        ['Season:', form_field('season', 'N/A')],
     ]
     
     # Add travel months if available
-    travel_months = form_data.get('travel_months', 'N/A')
+    travel_months = form_field('travel_months', 'N/A')
     if isinstance(travel_months, list):
         travel_months = ', '.join(travel_months)
     trip_details.append(['Travel Months:', travel_months])
     
     # Create table
     table = Table(trip_details, colWidths=[2*inch, 4*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F8FF')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2E86AB')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    table.setStyle(TRIP_TABLE_STYLE)
     
     story.append(table)
     story.append(Spacer(1, 20))
@@ -102,20 +208,20 @@ def generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id):
     # Trip Summary
     summary = trip_data.get('trip_summary', '')
     if summary and summary.strip():
-        story.append(Paragraph("📝 Trip Summary", heading_style))
-        story.append(Paragraph(summary, normal_style))
+        story.append(Paragraph("📝 Trip Summary", HEADING_STYLE))
+        story.append(Paragraph(summary, NORMAL_STYLE))
         story.append(Spacer(1, 20))
     
     # Special Requests
-    special_requests = form_data.get('special_requests', '').strip()
+    special_requests = form_field('special_requests', '').strip()
     if special_requests:
-        story.append(Paragraph("✨ Special Requests", heading_style))
-        story.append(Paragraph(special_requests, normal_style))
+        story.append(Paragraph("✨ Special Requests", HEADING_STYLE))
+        story.append(Paragraph(special_requests, NORMAL_STYLE))
         story.append(Spacer(1, 20))
     
     # Itinerary Section - Use markdown-pdf for better formatting
     if itinerary:
-        story.append(Paragraph("🗓️ Detailed Itinerary", heading_style))
+        story.append(Paragraph("🗓️ Detailed Itinerary", HEADING_STYLE))
         
         # Get itinerary content
         itinerary_content = ""
@@ -125,6 +231,9 @@ def generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id):
             itinerary_content = itinerary['demo_response']
         
         if itinerary_content:
+            # Collect the itinerary flowables locally and add them to the story in one go
+            itinerary_flowables = []
+            add = itinerary_flowables.append
             # Process the itinerary content with improved parsing
             try:
                 processed_content = clean_markdown_for_pdf(itinerary_content)
@@ -132,128 +241,62 @@ def generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id):
                 sections = extract_and_format_content_sections(processed_content)
                 
                 # Process each section
-                for section_name, section_content in sections.items():
-                    if not section_content.strip():
-                        continue
-                    
-                    lines = section_content.split('\n')
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if not line:
-                            continue
+                for section_content in sections.values():
+                    # Blank lines never match
+                    for match in LINE_CLASSIFIER_RE.finditer(section_content):
+                        kind = match.lastgroup
+                        line = match.group(kind)
                         
                         # Handle different heading levels
-                        if line.startswith('###'):
-                            heading_text = re.sub(r'^#+\s*', '', line)
-                            # Create a sub-heading style
-                            sub_heading_style = ParagraphStyle(
-                                'SubHeading',
-                                parent=heading_style,
-                                fontSize=14,
-                                spaceAfter=8,
-                                spaceBefore=15,
-                                textColor=colors.HexColor('#2E86AB')
-                            )
-                            story.append(Paragraph(heading_text, sub_heading_style))
-                            story.append(Spacer(1, 6))
+                        if kind == 'sub_heading':
+                            add(Paragraph(line.lstrip('#').lstrip(), SUB_HEADING_STYLE))
                         
-                        elif line.startswith('##'):
-                            heading_text = re.sub(r'^#+\s*', '', line)
-                            story.append(Paragraph(heading_text, heading_style))
-                            story.append(Spacer(1, 8))
+                        elif kind == 'heading':
+                            add(Paragraph(line.lstrip('#').lstrip(), ITINERARY_HEADING_STYLE))
                         
-                        elif line.startswith('#'):
-                            heading_text = re.sub(r'^#+\s*', '', line)
-                            story.append(Paragraph(heading_text, title_style))
-                            story.append(Spacer(1, 10))
+                        elif kind == 'title':
+                            add(Paragraph(line.lstrip('#').lstrip(), ITINERARY_TITLE_STYLE))
                         
                         # Handle bullet points with better formatting
-                        elif line.startswith('*') or line.startswith('-') or line.startswith('•'):
-                            bullet_text = re.sub(r'^[\*\-•]\s*', '', line)
+                        elif kind == 'bullet':
+                            # The classifier guarantees a one-character bullet marker
+                            bullet_text = line[1:].lstrip()
                             
                             # Check if this is a time-based bullet point
-                            time_pattern = r'^(\d{1,2}:\d{2}\s*[AP]M)'
-                            time_match = re.match(time_pattern, bullet_text)
-                            
-                            if time_match:
+                            if TIME_PREFIX_RE.match(bullet_text):
                                 # Special formatting for time-based activities
-                                time_style = ParagraphStyle(
-                                    'TimeStyle',
-                                    parent=normal_style,
-                                    leftIndent=20,
-                                    bulletIndent=10,
-                                    spaceAfter=4,
-                                    fontSize=10,
-                                    textColor=colors.HexColor('#A23B72')
-                                )
-                                story.append(Paragraph(f"• <b>{bullet_text}</b>", time_style))
+                                add(Paragraph(f"• <b>{bullet_text}</b>", TIME_STYLE))
                             else:
                                 # Regular bullet point
-                                bullet_style = ParagraphStyle(
-                                    'BulletStyle',
-                                    parent=normal_style,
-                                    leftIndent=20,
-                                    bulletIndent=10,
-                                    spaceAfter=4
-                                )
-                                story.append(Paragraph(f"• {bullet_text}", bullet_style))
-                            story.append(Spacer(1, 3))
-                        
-                        # Handle indented content (sub-bullets)
-                        elif line.startswith('    ') or line.startswith('\t'):
-                            indented_text = line.lstrip()
-                            indented_style = ParagraphStyle(
-                                'IndentedStyle',
-                                parent=normal_style,
-                                leftIndent=40,
-                                spaceAfter=3,
-                                fontSize=10
-                            )
-                            story.append(Paragraph(indented_text, indented_style))
-                            story.append(Spacer(1, 2))
+                                add(Paragraph(f"• {bullet_text}", BULLET_STYLE))
                         
-                        # Regular text
+                        # Regular text, links already converted to <a href> markup
                         else:
-                            # Check if line contains links and format accordingly
-                            if '<a href=' in line:
-                                # Line contains links, use normal style to preserve formatting
-                                story.append(Paragraph(line, normal_style))
-                            else:
-                                story.append(Paragraph(line, normal_style))
-                            story.append(Spacer(1, 4))
+                            add(Paragraph(line, ITINERARY_TEXT_STYLE))
                         
             except Exception as e:
                 # Fallback to simple text if processing fails
-                story.append(Paragraph(f"Error processing itinerary: {str(e)}", normal_style))
+                add(Paragraph(f"Error processing itinerary: {str(e)}", NORMAL_STYLE))
                 # Clean fallback content
                 fallback_content = clean_markdown_for_pdf(itinerary_content)
-                story.append(Paragraph(fallback_content.replace('\n', '<br/>'), normal_style))
+                add(Paragraph(fallback_content.replace('\n', '<br/>'), NORMAL_STYLE))
+            
+            story.extend(itinerary_flowables)
         else:
-            story.append(Paragraph("No detailed itinerary available.", normal_style))
+            story.append(Paragraph("No detailed itinerary available.", NORMAL_STYLE))
     
     # Footer with trip metadata
     story.append(Spacer(1, 30))
-    story.append(Paragraph("📋 Trip Information", heading_style))
+    story.append(Paragraph("📋 Trip Information", HEADING_STYLE))
     
     metadata_table = [
         ['Trip ID:', trip_id],
-        ['Generated:', datetime.now().strftime("%B %d, %Y at %I:%M %p")],
+        ['Generated:', format_generated_at(datetime.now())],
         ['Export Format:', 'PDF Document']
     ]
     
     meta_table = Table(metadata_table, colWidths=[2*inch, 4*inch])
-    meta_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F5F5F5')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    meta_table.setStyle(META_TABLE_STYLE)
     
     story.append(meta_table)
     
@@ -262,57 +305,54 @@ def generate_trip_pdf(trip_data, form_data, itinerary, trip_name, trip_id):
     buffer.seek(0)
     return buffer
 
+def _inline_markup(match):
+    """Translate one inline markdown match to ReportLab markup"""
+    kind = match.lastgroup
+    if kind == 'code':
+        return f'<font name="Courier">{match.group("code")}</font>'
+    
+    # Link text and emphasis may wrap further inline markdown
+    inner = INLINE_MARKDOWN_RE.sub(_inline_markup, match.group('link_text' if kind == 'url' else kind))
+    if kind == 'url':
+        return f'<a href="{match.group("url")}" color="blue">{inner}</a>'
+    if kind == 'bold':
+        return f'<b>{inner}</b>'
+    return f'<i>{inner}</i>'
+
 def clean_markdown_for_pdf(text):
     """Clean markdown text for PDF generation"""
     if not text:
         return ""
-     
-    # Convert markdown links to clickable PDF links
-    text = convert_markdown_links_to_pdf(text)
     
-    # Remove or convert markdown elements that don't work well in PDF
-    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)  # Bold
-    text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)      # Italic
-    text = re.sub(r'`(.*?)`', r'<font name="Courier">\1</font>', text)  # Code
+    # Plain text has nothing for the regex passes below to rewrite
+    if MARKDOWN_CHARS.isdisjoint(text) and '\n\n\n' not in text:
+        return text.strip()
+     
+    # Handle bullet points better (first, so a "* " marker is never read as italics)
+    text = BULLET_MARKER_RE.sub('• ', text)
     
-    # Handle bullet points better
-    text = re.sub(r'^\s*[\*\-\+]\s+', '• ', text, flags=re.MULTILINE)
+    # Convert links (clickable in the PDF), bold, italic and code in one pass
+    text = INLINE_MARKDOWN_RE.sub(_inline_markup, text)
     
     # Clean up excessive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = EXCESS_NEWLINES_RE.sub('\n\n', text)
     
     return text.strip()
 
-def prepare_markdown_content(content):
-    """Prepare markdown content for better PDF rendering"""
-    if not content:
-        return ""
-    
-    content = content.strip()
-    
-    if not content.startswith('#'):
-        content = f"# Trip Itinerary\n\n{content}"
-    
-    content = re.sub(r'\n(#{1,6})', r'\n\n\1', content)
-    content = re.sub(r'(#{1,6}.*?)\n([^#\n])', r'\1\n\n\2', content)
-    content = re.sub(r'\s*\*\s*(\d{1,2}:\d{2}\s*[AP]M)', r'\n\n* **\1**', content)
-    content = re.sub(r'^(\s*)\*\s*', r'\1* ', content, flags=re.MULTILINE)
-    content = re.sub(r'\n(\s*\*)', r'\n\n\1', content)
-    content = re.sub(r'\n{4,}', '\n\n\n', content)
-    content = content.lstrip('\n')
-    
-    return content
-
-def convert_markdown_links_to_pdf(text):
-    """Convert markdown links to ReportLab-compatible clickable links"""
-    def link_replacer(match):
-        link_text = match.group(1)
-        url = match.group(2)
-        return f'<a href="{url}" color="blue">{link_text}</a>'
-    
-    text = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', link_replacer, text)
-    
-    return text
+def _section_for_heading(line):
+    """Return the section a '### ' heading line starts, or None if it starts none"""
+    line = line.strip()
+    if not line.startswith('### '):
+        return None
+    lower = line.lower()
+    for keyword, section in SECTION_KEYWORDS:
+        if keyword in lower:
+            if keyword == 'day':
+                day_match = DAY_NUMBER_RE.search(lower)
+                if day_match:
+                    return f'day_{day_match.group(1)}'
+            return section
+    return None
 
 def extract_and_format_content_sections(content):
     """Extract and format different sections of the content for better PDF layout"""
@@ -323,31 +363,13 @@ def extract_and_format_content_sections(content):
     lines = content.split('\n')
     
     for line in lines:
-        line = line.strip()
-        
-        if line.startswith('### ') and any(keyword in line.lower() for keyword in ['flight', 'day', 'practical', 'budget', 'seasonal', 'creative']):
+        # Lines are kept unstripped; only possible headings pay for a strip()
+        new_section = _section_for_heading(line) if '### ' in line else None
+        if new_section:
             if current_content:
                 sections[current_section] = '\n'.join(current_content)
             
-            if 'flight' in line.lower():
-                current_section = 'flights'
-            elif 'day' in line.lower():
-                day_match = re.search(r'day\s+(\d+)', line.lower())
-                if day_match:
-                    current_section = f'day_{day_match.group(1)}'
-                else:
-                    current_section = 'daily_itinerary'
-            elif 'practical' in line.lower():
-                current_section = 'practical_tips'
-            elif 'budget' in line.lower():
-                current_section = 'budget'
-            elif 'seasonal' in line.lower():
-                current_section = 'seasonal'
-            elif 'creative' in line.lower():
-                current_section = 'creative'
-            else:
-                current_section = 'other'
-            
+            current_section = new_section
             current_content = [line]
         else:
             current_content.append(line)
@@ -355,4 +377,4 @@ def extract_and_format_content_sections(content):
     if current_content:
         sections[current_section] = '\n'.join(current_content)
     
-    return sections
\ No newline at end of file
+    return sections
@@ -55,6 +55,11 @@ def get_gemini_client():
         logger.error(f"Error initializing Gemini client: {e}")
         raise
 
+@st.cache_resource
+def get_trip_sense_ai():
+    """Create and cache a single TripSenseAI instance shared across reruns."""
+    return TripSenseAI()
+
 class TripSenseAI:
     def __init__(self):
         # Initialize metrics tracking
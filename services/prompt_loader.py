@@ -1,4 +1,5 @@
 import yaml
+from functools import lru_cache
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from typing import Any
 
@@ -12,7 +13,19 @@ def load_system_prompt() -> str:
         data = yaml.safe_load(f)
     return data["content"]
 
-def render_user_prompt(context: dict[str, Any]) -> str:
+@lru_cache(maxsize=1)
+def _get_user_template():
+    # Build the Jinja environment and compile the template once per process
     jinja_env = Environment(loader=FileSystemLoader(USER_PROMPT_PATH), autoescape=select_autoescape())
-    template = jinja_env.get_template(TEMPLATE_FILE)
-    return template.render(**context)
\ No newline at end of file
+    return jinja_env.get_template(TEMPLATE_FILE)
+
+def render_user_prompt(context: dict[str, Any]) -> str:
+    return _get_user_template().render(**context)
+
+@lru_cache(maxsize=64)
+def _render_user_prompt_items(context_items: tuple[tuple[str, Any], ...]) -> str:
+    return render_user_prompt(dict(context_items))
+
+def render_user_prompt_cached(context: dict[str, Any]) -> str:
+    """Render the user prompt, reusing the result for identical (hashable) contexts."""
+    return _render_user_prompt_items(tuple(sorted(context.items())))
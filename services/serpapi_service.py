@@ -20,6 +20,9 @@ load_dotenv()
 # Import airport code helper
 from services.airport_codes import get_airport_code, format_location_display
 
+# How long identical hotel/event searches are served from cache (seconds)
+SEARCH_CACHE_TTL = 3600
+
 def get_serpapi_key() -> Optional[str]:
     """Get SerpAPI key from environment."""
     api_key = os.getenv('SERPAPI_API_KEY')
@@ -240,6 +243,7 @@ def search_flights(origin: str, destination: str, departure_date: str, return_da
             'demo_mode': True
         }
 
+@st.cache_data(ttl=SEARCH_CACHE_TTL, show_spinner=False)
 def search_hotels(location: str, check_in: str, check_out: str, adults: int = 2, children: int = 0, currency: str = "USD") -> Dict[str, Any]:
     """
     Search for hotels using SerpAPI Google Hotels API.
@@ -370,6 +374,7 @@ def search_hotels(location: str, check_in: str, check_out: str, adults: int = 2,
             'demo_mode': True
         }
 
+@st.cache_data(ttl=SEARCH_CACHE_TTL, show_spinner=False)
 def search_events(location: str, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
     """
     Search for events using SerpAPI Google Events API.
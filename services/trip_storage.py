@@ -2,6 +2,7 @@ import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import uuid
+from functools import lru_cache
 import streamlit as st
 from services.firebase_service import get_firestore_client
 
@@ -133,6 +134,16 @@ def _load_trips_from_firestore_once(user_id: str):
         # Mark as loaded to prevent retries
         st.session_state[load_key] = True
     
+@lru_cache(maxsize=1024)
+def format_display_date(timestamp: Optional[str]) -> Optional[str]:
+    """Format an ISO timestamp as e.g. 'March 05, 2025', or None if it can't be parsed."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%B %d, %Y")
+    except (ValueError, TypeError, AttributeError):
+        return None
+
 def list_trips(user_id: str = "default") -> List[Dict[str, Any]]:
     """List all trips for a user from session state (loaded from Firestore once per session)."""
     user_id = str(user_id).replace('/', '_').replace('\\', '_').replace('..', '_')[:50]
@@ -143,6 +154,13 @@ def list_trips(user_id: str = "default") -> List[Dict[str, Any]]:
     # Always read from session state (which now contains Firestore data)
     trip_records = st.session_state.get("saved_trip_data", [])
     
+    # Reuse the summaries built on a previous rerun while the records are unchanged.
+    # Appends change the length, deletes rebind the list and updates bump trips_version.
+    cache_key = (len(trip_records), st.session_state.get("trips_version", 0))
+    cached = st.session_state.get("trip_summaries_cache")
+    if cached and cached[0] is trip_records and cached[1] == cache_key:
+        return cached[2]
+    
     trips = []
     seen_trip_ids = set()  # Track unique trip IDs to prevent duplicates
     
@@ -178,7 +196,10 @@ def list_trips(user_id: str = "default") -> List[Dict[str, Any]]:
                 "accommodation": form_data.get("accommodation", "Unknown"),
                 "special_requests": form_data.get("special_requests", "Unknown"),
                 "is_booked": trip_record.get("is_booked", False),
-                "booked_at": trip_record.get("booked_at", None)
+                "booked_at": trip_record.get("booked_at", None),
+                # Display strings formatted once here rather than on every page render
+                "created_at_display": format_display_date(trip_record.get("created_at")),
+                "booked_at_display": format_display_date(trip_record.get("booked_at"))
             }
             
             trips.append(summary)
@@ -189,8 +210,23 @@ def list_trips(user_id: str = "default") -> List[Dict[str, Any]]:
     
     # Sort by creation date (newest first), handle None values
     trips.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+    st.session_state.trip_summaries_cache = (trip_records, cache_key, trips)
     return trips
 
+def _trips_by_id() -> Dict[str, Dict[str, Any]]:
+    """Index the session's trip records by trip_id, rebuilt only when the list changes."""
+    trip_records = st.session_state.get("saved_trip_data", [])
+    cached = st.session_state.get("trips_by_id_cache")
+    if cached and cached[0] is trip_records and cached[1] == len(trip_records):
+        return cached[2]
+    
+    trips_by_id = {}
+    for trip_record in trip_records:
+        # Keep the first record for a trip_id, matching the old linear scan
+        trips_by_id.setdefault(trip_record.get("trip_id"), trip_record)
+    st.session_state.trips_by_id_cache = (trip_records, len(trip_records), trips_by_id)
+    return trips_by_id
+
 def load_trip(trip_id: str, user_id: str = "default") -> Optional[Dict[str, Any]]:
     """Load a specific trip by ID from session state (already cached from Firestore)."""
     # Ensure trips are loaded from Firestore (only happens once)
@@ -198,11 +234,7 @@ def load_trip(trip_id: str, user_id: str = "default") -> Optional[Dict[str, Any]
     _load_trips_from_firestore_once(user_id)
     
     # Find trip in session state
-    for trip_record in st.session_state.get("saved_trip_data", []):
-        if trip_record.get("trip_id") == trip_id:
-            return trip_record
-    
-    return None
+    return _trips_by_id().get(trip_id)
 
 def update_trip(trip_id: str, updates: Dict[str, Any], user_id: str = "default") -> bool:
     """
@@ -235,6 +267,7 @@ def update_trip(trip_id: str, updates: Dict[str, Any], user_id: str = "default")
             # Apply updates to the trip record
             for key, value in updates.items():
                 trip_record[key] = value
+            st.session_state.trips_version = st.session_state.get("trips_version", 0) + 1
             print(f"Trip {trip_id} updated in session state")
             return True
     
@@ -267,17 +300,15 @@ def delete_trip(trip_id: str, user_id: str = "default") -> bool:
     
     # Delete from session state
     if "saved_trip_data" in st.session_state:
-        initial_count = len(st.session_state.saved_trip_data)
+        if trip_id not in _trips_by_id():
+            print(f"Trip {trip_id} not found in session state")
+            return False
+        
         st.session_state.saved_trip_data = [
             t for t in st.session_state.saved_trip_data 
             if t.get('trip_id') != trip_id
         ]
-        deleted = len(st.session_state.saved_trip_data) < initial_count
-        if deleted:
-            print(f"Trip {trip_id} deleted from session state")
-            return True
-        else:
-            print(f"Trip {trip_id} not found in session state")
-            return False
+        print(f"Trip {trip_id} deleted from session state")
+        return True
     
     return False
\ No newline at end of file
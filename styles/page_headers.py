@@ -24,6 +24,9 @@ CHATBOT_HEADER = f"""
     </div>
 """
 
+# Chatbot trip description line (format with the description text)
+CHATBOT_TRIP_DESCRIPTION = """<p style="text-align: center; margin: 0.5rem 0 0 0; opacity: 0.9;">{}</p>"""
+
 # Trips Page Header
 TRIPS_HEADER = f"""
     <div style="text-align: center; padding: 3rem 0;">
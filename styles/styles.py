@@ -23,6 +23,7 @@ from styles.landing import (
 from styles.page_headers import (
     FORM_PAGE_HTML,
     CHATBOT_HEADER,
+    CHATBOT_TRIP_DESCRIPTION,
     TRIPS_HEADER,
     BOOK_HEADER
 )
@@ -43,6 +44,7 @@ __all__ = [
     # Page headers
     'FORM_PAGE_HTML',
     'CHATBOT_HEADER',
+    'CHATBOT_TRIP_DESCRIPTION',
     'TRIPS_HEADER',
     'BOOK_HEADER'
 ]
\ No newline at end of file
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from services.export import clean_markdown_for_pdf
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("**bold**", "<b>bold</b>"),
+    ("*italic*", "<i>italic</i>"),
+    ("`code`", '<font name="Courier">code</font>'),
+    ("[Site](https://example.com)", '<a href="https://example.com" color="blue">Site</a>'),
+    ("*a* and *b*", "<i>a</i> and <i>b</i>"),
+])
+def test_inline_conversions(text, expected):
+    assert clean_markdown_for_pdf(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("*a **b** c*", "<i>a <b>b</b> c</i>"),
+    ("**a *b* c**", "<b>a <i>b</i> c</b>"),
+    ("[**Louvre**](https://louvre.fr)", '<a href="https://louvre.fr" color="blue"><b>Louvre</b></a>'),
+    ("**see [map](https://m.com)**", '<b>see <a href="https://m.com" color="blue">map</a></b>'),
+])
+def test_nested_inline_conversions(text, expected):
+    assert clean_markdown_for_pdf(text) == expected
+
+
+def test_code_body_is_not_converted():
+    assert clean_markdown_for_pdf("`*x*`") == '<font name="Courier">*x*</font>'
+
+
+def test_bullet_markers_are_not_read_as_italics():
+    assert clean_markdown_for_pdf("* **9:00 AM** Breakfast\n* Walk") == "• <b>9:00 AM</b> Breakfast\n• Walk"
+
+
+def test_plain_text_and_newlines():
+    assert clean_markdown_for_pdf("") == ""
+    assert clean_markdown_for_pdf("  plain text  ") == "plain text"
+    assert clean_markdown_for_pdf("a\n\n\n\nb") == "a\n\nb"
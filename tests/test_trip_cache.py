@@ -0,0 +1,197 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class SessionState(dict):
+    """Minimal stand-in for st.session_state (attribute and item access)."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class FakeDocument:
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.id = doc_id
+
+    def set(self, data):
+        self.store[self.id] = dict(data)
+
+    def update(self, updates):
+        self.store[self.id].update(updates)
+
+    def delete(self):
+        self.store.pop(self.id, None)
+
+    def to_dict(self):
+        return dict(self.store[self.id])
+
+
+class FakeQuery:
+    def __init__(self, store, field_filter):
+        self.store = store
+        self.field_filter = field_filter
+
+    def stream(self):
+        field, _, value = self.field_filter
+        return [FakeDocument(self.store, doc_id) for doc_id, doc in list(self.store.items()) if doc.get(field) == value]
+
+
+class FakeFirestore:
+    """Just enough of the Firestore client for services.trip_storage."""
+
+    def __init__(self):
+        self.store = {}
+        self.next_id = 0
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id=None):
+        if doc_id is None:
+            self.next_id += 1
+            doc_id = f"fs{self.next_id}"
+        return FakeDocument(self.store, doc_id)
+
+    def where(self, filter):
+        return FakeQuery(self.store, filter)
+
+
+def _install_modules(monkeypatch, db):
+    fake_st = types.ModuleType("streamlit")
+    fake_st.session_state = SessionState()
+    monkeypatch.setitem(sys.modules, "streamlit", fake_st)
+
+    firebase_service = types.ModuleType("services.firebase_service")
+    firebase_service.get_firestore_client = lambda: db
+    monkeypatch.setitem(sys.modules, "services.firebase_service", firebase_service)
+
+    base_query = types.ModuleType("google.cloud.firestore_v1.base_query")
+    base_query.FieldFilter = lambda field, op, value: (field, op, value)
+    for name in ("google", "google.cloud", "google.cloud.firestore_v1"):
+        monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setitem(sys.modules, "google.cloud.firestore_v1.base_query", base_query)
+
+    monkeypatch.delitem(sys.modules, "services.trip_storage", raising=False)
+    return importlib.import_module("services.trip_storage"), fake_st.session_state
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """trip_storage backed by session state only (no Firebase)."""
+    module, _ = _install_modules(monkeypatch, None)
+    return module
+
+
+@pytest.fixture
+def firestore_storage(monkeypatch):
+    db = FakeFirestore()
+    module, session_state = _install_modules(monkeypatch, db)
+    return module, db, session_state
+
+
+def _trip(name):
+    return {"trip_name": name, "form_data": {"destination": name + " City"}}
+
+
+def _ids(summaries):
+    return [trip["trip_id"] for trip in summaries]
+
+
+def test_save_is_visible_to_summaries_and_lookup(storage):
+    assert storage.list_trips("user1") == []
+
+    first = storage.save_trip(_trip("Paris"), "user1")
+    assert _ids(storage.list_trips("user1")) == [first["trip_id"]]
+
+    second = storage.save_trip(_trip("Rome"), "user1")
+    assert set(_ids(storage.list_trips("user1"))) == {first["trip_id"], second["trip_id"]}
+    assert storage.load_trip(second["trip_id"], "user1") is second
+    assert storage.load_trip(first["trip_id"], "user1") is first
+
+
+def test_unchanged_records_reuse_summaries(storage):
+    storage.save_trip(_trip("Paris"), "user1")
+    assert storage.list_trips("user1") is storage.list_trips("user1")
+
+
+def test_update_is_visible_to_summaries_and_lookup(storage):
+    record = storage.save_trip(_trip("Paris"), "user1")
+    trip_id = record["trip_id"]
+    assert storage.list_trips("user1")[0]["is_booked"] is False
+    assert storage.load_trip(trip_id, "user1")["trip_data"]["trip_name"] == "Paris"
+
+    assert storage.update_trip(trip_id, {"is_booked": True, "booked_at": "2025-03-05T10:00:00"}, "user1")
+
+    summary = storage.list_trips("user1")[0]
+    assert summary["is_booked"] is True
+    assert summary["booked_at_display"] == "March 05, 2025"
+    assert storage.load_trip(trip_id, "user1")["is_booked"] is True
+
+
+def test_delete_is_visible_to_summaries_and_lookup(storage):
+    kept = storage.save_trip(_trip("Paris"), "user1")
+    deleted = storage.save_trip(_trip("Rome"), "user1")
+    assert len(storage.list_trips("user1")) == 2
+    assert storage.load_trip(deleted["trip_id"], "user1") is deleted
+
+    assert storage.delete_trip(deleted["trip_id"], "user1")
+
+    assert _ids(storage.list_trips("user1")) == [kept["trip_id"]]
+    assert storage.load_trip(deleted["trip_id"], "user1") is None
+    assert storage.load_trip(kept["trip_id"], "user1") is kept
+    assert storage.delete_trip(deleted["trip_id"], "user1") is False
+
+
+def test_delete_then_save_same_length_is_visible(storage):
+    first = storage.save_trip(_trip("Paris"), "user1")
+    storage.list_trips("user1")
+    storage.load_trip(first["trip_id"], "user1")
+
+    storage.delete_trip(first["trip_id"], "user1")
+    replacement = storage.save_trip(_trip("Rome"), "user1")
+
+    assert _ids(storage.list_trips("user1")) == [replacement["trip_id"]]
+    assert storage.load_trip(first["trip_id"], "user1") is None
+    assert storage.load_trip(replacement["trip_id"], "user1") is replacement
+
+
+def test_firestore_reload_is_visible_to_summaries_and_lookup(firestore_storage):
+    storage, db, session_state = firestore_storage
+    saved = storage.save_trip(_trip("Paris"), "user1")
+    assert _ids(storage.list_trips("user1")) == [saved["trip_id"]]
+    assert storage.load_trip(saved["trip_id"], "user1")["trip_data"]["trip_name"] == "Paris"
+
+    # Another device changes the user's trips, then the session reloads from Firestore
+    db.store.pop(saved["trip_id"])
+    db.document("remote1").set({
+        "trip_id": "remote1",
+        "user_id": "user1",
+        "created_at": "2025-03-06T10:00:00",
+        "trip_data": _trip("Tokyo"),
+    })
+    session_state.pop("firestore_trips_loaded_user1")
+
+    assert _ids(storage.list_trips("user1")) == ["remote1"]
+    assert storage.load_trip("remote1", "user1")["trip_data"]["trip_name"] == "Tokyo"
+    assert storage.load_trip(saved["trip_id"], "user1") is None
+
+
+def test_duplicate_records_keep_the_first(storage):
+    record = storage.save_trip(_trip("Paris"), "user1")
+    duplicate = dict(record, trip_data=_trip("Copy"))
+    storage._save_to_session(duplicate)
+
+    summaries = storage.list_trips("user1")
+    assert len(summaries) == 1
+    assert summaries[0]["trip_name"] == "Paris"
+    assert storage.load_trip(record["trip_id"], "user1") is record